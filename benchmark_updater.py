@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark for the Repository Status Updater
+Runs update_repo_status.main() end to end against a local fake GitHub API
+and reports wall time, requests per endpoint, bytes transferred and peak memory
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import multiprocessing
+from datetime import datetime, timezone
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Repository names hardcoded in update_repo_status.load_config
+CONFIGURED_REPOS = [
+    'python-data-analytics',
+    'ml-model-deployment',
+    'react-component-library',
+    'nextjs-applications',
+    'python-api-services',
+    'data-processing-pipelines'
+]
+
+README_TEMPLATE = """# Benchmark Profile
+
+<!-- START:repos -->
+| Repository | Status | Language | Stars | Forks | Issues | Last Commit |
+|------------|--------|----------|-------|-------|--------|-------------|
+| placeholder | - | - | - | - | - | - |
+<!-- END:repos -->
+
+---
+
+<!-- LAST_UPDATED:never -->
+"""
+
+@dataclass
+class FakeServerConfig:
+    """Behaviour of the fake GitHub API"""
+    username: str = 'bench-user'
+    repos: int = 6
+    seed: int = 42
+    latency_ms: float = 0.0
+    max_commits: int = 1500
+    etags: bool = True
+    stats_pending: int = 1
+    secondary_limit_every: int = 0
+    retry_after: int = 0
+    rate_limit: int = 1000000
+
+@dataclass
+class BenchmarkResult:
+    """Measurements from one updater run"""
+    run: int
+    repos: int
+    exit_code: int
+    wall_time: float
+    requests: int
+    bytes_sent: int
+    not_modified: int
+    peak_memory_mb: float
+    endpoints: Dict[str, int]
+
+class FakeGitHub:
+    """Synthetic GitHub data set, generated deterministically from a seed"""
+
+    def __init__(self, config: FakeServerConfig):
+        self.config = config
+        rng = random.Random(config.seed)
+        now = time.time()
+
+        names = CONFIGURED_REPOS[:config.repos]
+        names += [f'repo-{i:05d}' for i in range(config.repos - len(names))]
+
+        languages = ['Python', 'TypeScript', 'JavaScript', 'Go', 'Rust', 'Shell', 'HTML']
+        self.repos: Dict[str, Dict] = {}
+        for name in names:
+            # Long-tailed activity: most repos are quiet, a few are very busy
+            commit_count = min(int(rng.paretovariate(1.2) * 5) - 5, config.max_commits)
+            commit_times = sorted(
+                (now - rng.uniform(0, 90 * 86400) for _ in range(max(commit_count, 0))),
+                reverse=True
+            )
+            pushed_at = commit_times[0] if commit_times else now - rng.uniform(90, 900) * 86400
+            self.repos[name] = {
+                'name': name,
+                'fork': rng.random() < 0.1,
+                'archived': rng.random() < 0.05,
+                'stars': int(rng.paretovariate(1.1) * 3),
+                'forks': int(rng.paretovariate(1.3)),
+                'issues_open': rng.randint(0, 40),
+                'issues_closed': rng.randint(0, 200),
+                'prs_open': rng.randint(0, 20),
+                'prs_closed': rng.randint(0, 300),
+                'pushed_at': pushed_at,
+                'commit_times': commit_times,
+                'languages': {
+                    lang: rng.randint(1000, 500000)
+                    for lang in rng.sample(languages, rng.randint(1, 3))
+                }
+            }
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _parse_since(value: str) -> float:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _endpoint_name(path: str) -> str:
+    """Collapse a request path into an endpoint label"""
+    path = re.sub(r'^/repos/[^/]+/[^/]+', '/repos/:repo', path)
+    path = re.sub(r'^/(users|orgs)/[^/]+', r'/\1/:owner', path)
+    return path
+
+def make_handler(data: FakeGitHub, stats: Dict):
+    """Build a request handler class bound to the given data set and shared counters"""
+    config = data.config
+    # ThreadingHTTPServer runs each request on its own thread
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _count(self, endpoint: str, size: int, status: int):
+            with lock:
+                stats['requests'] += 1
+                stats['bytes'] += size
+                stats['endpoints'][endpoint] = stats['endpoints'].get(endpoint, 0) + 1
+                if status == 304:
+                    stats['not_modified'] += 1
+
+        def _send_json(self, endpoint: str, body, status: int = 200, headers: Optional[Dict] = None):
+            payload = json.dumps(body).encode('utf-8') if body is not None else b''
+            etag = f'"{hashlib.md5(payload).hexdigest()}"'
+
+            if status == 200 and config.etags and self.headers.get('If-None-Match') == etag:
+                status, payload = 304, b''
+
+            # Conditional 304 responses are free, like on GitHub
+            with lock:
+                if status != 304:
+                    stats['budget'] = max(stats['budget'] - 1, 0)
+                remaining = stats['budget']
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('X-RateLimit-Limit', str(config.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+            if config.etags and status in (200, 304):
+                self.send_header('ETag', etag)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+            self._count(endpoint, len(payload), status)
+
+        def _throttled(self, endpoint: str) -> bool:
+            """Inject a secondary rate limit response every N requests"""
+            if not config.secondary_limit_every:
+                return False
+            with lock:
+                stats['seen'] += 1
+                seen = stats['seen']
+            if seen % config.secondary_limit_every:
+                return False
+            self._send_json(
+                endpoint, {'message': 'You have exceeded a secondary rate limit.'}, status=403,
+                headers={'Retry-After': str(config.retry_after)}
+            )
+            return True
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            path = parsed.path
+
+            if path == '/__stats':
+                with lock:
+                    body = json.loads(json.dumps(stats))
+                return self._send_raw(body)
+            if path == '/__reset':
+                with lock:
+                    stats.update(requests=0, bytes=0, not_modified=0, endpoints={})
+                return self._send_raw({})
+
+            endpoint = _endpoint_name(path)
+            if config.latency_ms:
+                time.sleep(config.latency_ms / 1000)
+            if self._throttled(endpoint):
+                return
+
+            parts = path.strip('/').split('/')
+            if parts[0] in ('users', 'orgs') and len(parts) == 2:
+                return self._send_json(endpoint, {
+                    'login': parts[1], 'type': 'User', 'public_repos': len(data.repos),
+                    'followers': 10, 'following': 2
+                })
+            if parts[0] in ('users', 'orgs') and parts[-1] == 'repos':
+                return self._send_json(endpoint, self._page(
+                    [self._repo_json(repo) for repo in data.repos.values()], query
+                ))
+            if parts[0] == 'rate_limit':
+                return self._send_json(endpoint, {'resources': {'core': {
+                    'limit': config.rate_limit, 'remaining': stats['budget'],
+                    'reset': int(time.time()) + 3600
+                }}})
+            if parts[0] == 'repos' and len(parts) >= 3:
+                repo = data.repos.get(parts[2])
+                if not repo:
+                    return self._send_json(endpoint, {'message': 'Not Found'}, status=404)
+                resource = '/'.join(parts[3:])
+                if not resource:
+                    return self._send_json(endpoint, self._repo_json(repo))
+                if resource == 'languages':
+                    return self._send_json(endpoint, repo['languages'])
+                if resource == 'commits':
+                    since = _parse_since(query['since']) if 'since' in query else 0
+                    commits = [self._commit_json(repo, i, t) for i, t in enumerate(repo['commit_times']) if t >= since]
+                    return self._send_json(endpoint, self._page(commits, query))
+                if resource == 'stats/commit_activity':
+                    key = f"stats:{repo['name']}"
+                    with lock:
+                        stats['pending'][key] = stats['pending'].get(key, 0) + 1
+                        polls = stats['pending'][key]
+                    if polls <= config.stats_pending:
+                        return self._send_json(endpoint, {}, status=202)
+                    return self._send_json(endpoint, self._commit_activity(repo))
+                if resource in ('issues', 'pulls'):
+                    return self._send_json(endpoint, self._page(self._items(repo, resource, query), query))
+
+            self._send_json(endpoint, {'message': 'Not Found'}, status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            endpoint = _endpoint_name(urlparse(self.path).path)
+            if config.latency_ms:
+                time.sleep(config.latency_ms / 1000)
+            if self._throttled(endpoint):
+                return
+
+            variables = request.get('variables', {})
+            since7 = _parse_since(variables['since7']) if 'since7' in variables else None
+            since30 = _parse_since(variables['since30']) if 'since30' in variables else None
+            result = {}
+            for key, name in variables.items():
+                if not re.fullmatch(r'n\d+', key):
+                    continue
+                repo = data.repos.get(name)
+                result[f'r{key[1:]}'] = self._graphql_node(repo, since7, since30) if repo else None
+            self._send_json(endpoint, {'data': result})
+
+        def _send_raw(self, body):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _page(self, items: List, query: Dict) -> List:
+            per_page = int(query.get('per_page', 30))
+            page = int(query.get('page', 1))
+            return items[(page - 1) * per_page:page * per_page]
+
+        def _repo_json(self, repo: Dict) -> Dict:
+            owner = config.username
+            return {
+                'name': repo['name'],
+                'full_name': f"{owner}/{repo['name']}",
+                'owner': {'login': owner},
+                'fork': repo['fork'],
+                'archived': repo['archived'],
+                'stargazers_count': repo['stars'],
+                'watchers_count': repo['stars'],
+                'forks_count': repo['forks'],
+                'open_issues_count': repo['issues_open'] + repo['prs_open'],
+                'language': max(repo['languages'], key=repo['languages'].get),
+                'size': sum(repo['languages'].values()) // 1024,
+                'pushed_at': _iso(repo['pushed_at']),
+                'updated_at': _iso(repo['pushed_at']),
+                'created_at': _iso(repo['pushed_at'] - 400 * 86400),
+                'html_url': f"https://github.com/{owner}/{repo['name']}",
+                'url': f"https://api.github.com/repos/{owner}/{repo['name']}"
+            }
+
+        def _commit_json(self, repo: Dict, index: int, epoch: float) -> Dict:
+            """A commit object of realistic size, including the fields the updater ignores"""
+            sha = hashlib.sha1(f"{repo['name']}:{index}".encode()).hexdigest()
+            person = {'name': 'Bench Author', 'email': 'bench@example.com', 'date': _iso(epoch)}
+            url = f"https://api.github.com/repos/{config.username}/{repo['name']}"
+            return {
+                'sha': sha,
+                'node_id': f'C_{sha[:20]}',
+                'commit': {
+                    'author': person,
+                    'committer': person,
+                    'message': f'Synthetic commit {index} for {repo["name"]}',
+                    'tree': {'sha': sha[::-1], 'url': f'{url}/git/trees/{sha[::-1]}'},
+                    'url': f'{url}/git/commits/{sha}',
+                    'comment_count': 0,
+                    'verification': {'verified': False, 'reason': 'unsigned', 'signature': None, 'payload': None}
+                },
+                'url': f'{url}/commits/{sha}',
+                'html_url': f"https://github.com/{config.username}/{repo['name']}/commit/{sha}",
+                'comments_url': f'{url}/commits/{sha}/comments',
+                'author': {'login': 'bench-author', 'id': 1, 'type': 'User'},
+                'committer': {'login': 'bench-author', 'id': 1, 'type': 'User'},
+                'parents': [{'sha': sha[1:] + '0', 'url': f'{url}/commits/{sha[1:]}0'}]
+            }
+
+        def _commit_activity(self, repo: Dict) -> List[Dict]:
+            now = time.time()
+            first_week = int((now - 52 * 7 * 86400) // (7 * 86400) * (7 * 86400))
+            weeks = []
+            for w in range(53):
+                start = first_week + w * 7 * 86400
+                days = [0] * 7
+                for t in repo['commit_times']:
+                    if start <= t < start + 7 * 86400:
+                        days[int((t - start) // 86400)] += 1
+                weeks.append({'week': start, 'total': sum(days), 'days': days})
+            return weeks
+
+        def _items(self, repo: Dict, resource: str, query: Dict) -> List[Dict]:
+            state = query.get('state', 'open')
+            key = 'prs' if resource == 'pulls' else 'issues'
+            count = repo[f'{key}_open'] if state == 'open' else repo[f'{key}_closed']
+            items = [{'number': i + 1, 'state': state, 'title': f'{key} {i}'} for i in range(count)]
+            if resource == 'issues':
+                # The issues endpoint also lists pull requests
+                prs = repo['prs_open'] if state == 'open' else repo['prs_closed']
+                items += [{'number': 10000 + i, 'state': state, 'pull_request': {}} for i in range(prs)]
+            return items
+
+        def _graphql_node(self, repo: Dict, since7: Optional[float], since30: Optional[float]) -> Dict:
+            node = {
+                'name': repo['name'],
+                'stargazerCount': repo['stars'],
+                'forkCount': repo['forks'],
+                'isArchived': repo['archived'],
+                'updatedAt': _iso(repo['pushed_at']),
+                'pushedAt': _iso(repo['pushed_at']),
+                'languages': {'edges': [
+                    {'size': size, 'node': {'name': lang}} for lang, size in repo['languages'].items()
+                ]},
+                'openIssues': {'totalCount': repo['issues_open']},
+                'closedIssues': {'totalCount': repo['issues_closed']},
+                'openPullRequests': {'totalCount': repo['prs_open']},
+                'closedPullRequests': {'totalCount': repo['prs_closed']}
+            }
+            if since7 is not None:
+                times = repo['commit_times']
+                node['defaultBranchRef'] = {'target': {
+                    'recent7': {'totalCount': sum(1 for t in times if t >= since7)},
+                    'recent30': {'totalCount': sum(1 for t in times if t >= since30)},
+                    'latest': {'nodes': [{'committedDate': _iso(times[0])}] if times else []}
+                }}
+            return node
+
+    return Handler
+
+def serve(config: FakeServerConfig, port_queue):
+    """Run the fake API until the process is terminated"""
+    data = FakeGitHub(config)
+    stats = {
+        'requests': 0, 'bytes': 0, 'not_modified': 0, 'endpoints': {},
+        'budget': config.rate_limit, 'seen': 0, 'pending': {}
+    }
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(data, stats))
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def _server_call(port: int, path: str) -> Dict:
+    import urllib.request
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}') as response:
+        return json.loads(response.read())
+
+def run_benchmark(config: FakeServerConfig, runs: int = 2, env: Optional[Dict[str, str]] = None) -> List[BenchmarkResult]:
+    """Start the fake API, run the updater `runs` times in a scratch directory and measure each run"""
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(config, port_queue), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=60)
+
+    workdir = tempfile.mkdtemp(prefix='updater-bench-')
+    original_cwd = os.getcwd()
+    original_env = dict(os.environ)
+    results = []
+
+    try:
+        os.chdir(workdir)
+        with open('README.md', 'w', encoding='utf-8') as f:
+            f.write(README_TEMPLATE)
+
+        os.environ.update({
+            'GITHUB_TOKEN': 'benchmark-token',
+            'GITHUB_USERNAME': config.username,
+            'GITHUB_API_URL': f'http://127.0.0.1:{port}',
+            'GITHUB_MAX_RPS': '100000',
+            'GITHUB_STATE_DIR': os.path.join(workdir, '.github_state'),
+            'GITHUB_CACHE_DIR': os.path.join(workdir, '.github_cache')
+        })
+        if config.repos != len(CONFIGURED_REPOS):
+            os.environ['GITHUB_DISCOVER_REPOS'] = 'true'
+            os.environ.setdefault('GITHUB_INCLUDE_FORKS', 'true')
+        os.environ.update(env or {})
+
+        if SCRIPT_DIR not in sys.path:
+            sys.path.insert(0, SCRIPT_DIR)
+        import update_repo_status
+        logging.getLogger().setLevel(logging.WARNING)
+
+        for run in range(1, runs + 1):
+            _server_call(port, '/__reset')
+            tracemalloc.start()
+            start = time.perf_counter()
+            exit_code = update_repo_status.main()
+            wall_time = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            stats = _server_call(port, '/__stats')
+            results.append(BenchmarkResult(
+                run=run,
+                repos=config.repos,
+                exit_code=exit_code,
+                wall_time=round(wall_time, 3),
+                requests=stats['requests'],
+                bytes_sent=stats['bytes'],
+                not_modified=stats['not_modified'],
+                peak_memory_mb=round(peak / (1024 * 1024), 2),
+                endpoints=dict(sorted(stats['endpoints'].items()))
+            ))
+    finally:
+        os.chdir(original_cwd)
+        os.environ.clear()
+        os.environ.update(original_env)
+        server.terminate()
+        server.join()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Render results as a plain-text report"""
+    lines = []
+    for result in results:
+        lines.append(
+            f"run {result.run}: {result.repos} repos, exit {result.exit_code}, "
+            f"{result.wall_time:.2f}s, {result.requests} requests ({result.not_modified} not modified), "
+            f"{result.bytes_sent / 1024:.1f} KiB, peak {result.peak_memory_mb:.1f} MiB"
+        )
+        for endpoint, count in result.endpoints.items():
+            lines.append(f"    {count:>7}  {endpoint}")
+    return "\n".join(lines)
+
+def main():
+    """Parse arguments, run the benchmark and print or save the report"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repos', type=int, default=6, help='number of repositories (6 uses the configured list)')
+    parser.add_argument('--runs', type=int, default=2, help='consecutive runs sharing cache and state')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added latency per request')
+    parser.add_argument('--max-commits', type=int, default=1500, help='cap on synthetic commits per repository')
+    parser.add_argument('--no-etags', action='store_true', help='never answer 304 Not Modified')
+    parser.add_argument('--stats-pending', type=int, default=1, help='202 responses before commit stats are ready')
+    parser.add_argument('--secondary-limit-every', type=int, default=0, help='return a 403 secondary limit every N requests')
+    parser.add_argument('--retry-after', type=int, default=0, help='Retry-After seconds on injected 403s')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra environment for the updater, e.g. GITHUB_FETCH_BACKEND=graphql')
+    parser.add_argument('--json', metavar='PATH', help='also write results as JSON')
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        repos=args.repos,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        max_commits=args.max_commits,
+        etags=not args.no_etags,
+        stats_pending=args.stats_pending,
+        secondary_limit_every=args.secondary_limit_every,
+        retry_after=args.retry_after
+    )
+    env = dict(item.split('=', 1) for item in args.env)
+
+    results = run_benchmark(config, runs=args.runs, env=env)
+    print(format_results(results))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    return 0 if all(result.exit_code == 0 for result in results) else 1
+
+if __name__ == "__main__":
+    exit(main())
@@ -7,12 +7,30 @@ Includes comprehensive error handling, logging, and flexible configuration
 
 import os
 import re
+import time
+import csv
+import hashlib
+import io
+import hmac
+import html
+import shutil
+import fnmatch
+import sqlite3
+import math
+import mmap
+import random
+import functools
+import threading
 import requests
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlparse
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Configure logging
@@ -26,6 +44,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class PaginationError(requests.RequestException):
+    """A page of a paginated listing could not be fetched"""
+
 class RepoStatus(Enum):
     """Repository status levels"""
     VERY_ACTIVE = "Very Active"
@@ -43,58 +64,1501 @@ class RepoConfig:
     track_prs: bool = True
     custom_status: Optional[str] = None
 
+@dataclass
+class RepoSnapshot:
+    """Data fetched for one repository during a run, shared by every renderer"""
+    config: RepoConfig
+    repo_info: Optional[Dict] = None
+    languages: Dict[str, int] = field(default_factory=dict)
+    commits_7d: int = 0
+    commits_30d: int = 0
+    status: Optional[RepoStatus] = None
+    primary_language: str = "Unknown"
+    open_issues: Optional[int] = None
+    closed_issues: Optional[int] = None
+    open_prs: Optional[int] = None
+    closed_prs: Optional[int] = None
+    last_commit_date: Optional[str] = None
+    restored: bool = False  # True when loaded from the run checkpoint instead of fetched this run
+    
+    @property
+    def name(self) -> str:
+        return self.config.name
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the repository was fetched successfully"""
+        return self.repo_info is not None
+    
+    def to_dict(self) -> Dict:
+        """Serializable form, without the config or run-local flags"""
+        data = {key: value for key, value in self.__dict__.items() if key not in ('config', 'restored')}
+        data['status'] = self.status.value if self.status else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, config: RepoConfig, data: Dict) -> 'RepoSnapshot':
+        """Rebuild a snapshot saved with to_dict"""
+        values = dict(data)
+        values['status'] = RepoStatus(values['status']) if values.get('status') else None
+        known = set(cls.__dataclass_fields__) - {'config'}
+        return cls(config=config, **{key: value for key, value in values.items() if key in known})
+
+# Fields fetched per repository by the GraphQL backend
+GRAPHQL_REPO_FRAGMENT = """
+fragment RepoFields on Repository {
+  name
+  stargazerCount
+  forkCount
+  isArchived
+  updatedAt
+  pushedAt
+  languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+    edges { size node { name } }
+  }
+  ...CountFields
+  defaultBranchRef {
+    target {
+      ... on Commit {
+        recent7: history(since: $since7) { totalCount }
+        recent30: history(since: $since30) { totalCount }
+        latest: history(first: 1) { nodes { committedDate } }
+      }
+    }
+  }
+}
+"""
+
+# Issue and pull request totals, without downloading the objects themselves
+GRAPHQL_COUNTS_FRAGMENT = """
+fragment CountFields on Repository {
+  openIssues: issues(states: OPEN) { totalCount }
+  closedIssues: issues(states: CLOSED) { totalCount }
+  openPullRequests: pullRequests(states: OPEN) { totalCount }
+  closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+}
+"""
+
+class ReadmeDocument:
+    """README parsed once into plain text and <!-- START:name --> ... <!-- END:name --> sections"""
+    
+    MARKER = re.compile(r'<!-- (START|END):([\w.-]+) -->')
+    
+    def __init__(self, content: str):
+        # Text and section bodies in document order; section bodies sit at the indexes in _sections
+        self._parts: List[str] = []
+        self._sections: Dict[str, int] = {}
+        self.changed: List[str] = []
+        
+        position = 0
+        open_name, body_start = None, 0
+        for marker in self.MARKER.finditer(content):
+            kind, name = marker.groups()
+            if kind == 'START' and open_name is None:
+                open_name, body_start = name, marker.end()
+            elif kind == 'END' and name == open_name:
+                self._parts.append(content[position:body_start])
+                self._sections.setdefault(name, len(self._parts))
+                self._parts.append(content[body_start:marker.start()])
+                position = marker.start()
+                open_name = None
+        self._parts.append(content[position:])
+    
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def has(self, name: str) -> bool:
+        """Whether the document contains the named section"""
+        return name in self._sections
+    
+    def get(self, name: str) -> Optional[str]:
+        """Current body of a section, without the surrounding newlines"""
+        if name not in self._sections:
+            return None
+        return self._parts[self._sections[name]].strip('\n')
+    
+    def set(self, name: str, body: str) -> bool:
+        """Replace a section's body; returns whether its content actually changed"""
+        if name not in self._sections:
+            raise KeyError(f"README has no section '{name}'")
+        index = self._sections[name]
+        new_body = '\n' + body + '\n'
+        if self._digest(new_body) == self._digest(self._parts[index]):
+            return False
+        self._parts[index] = new_body
+        self.changed.append(name)
+        return True
+    
+    def render(self) -> str:
+        """The full document text"""
+        return ''.join(self._parts)
+
+def add_table_markers(content: str, name: str = 'repos') -> Optional[str]:
+    """Wrap a marker-less repository table in <!-- START:name -->/<!-- END:name -->, or None if there is none"""
+    start = content.find('| Repository | Status | Language | Stars | Forks |')
+    if start == -1 or (start > 0 and content[start - 1] != '\n'):
+        return None
+    
+    # The table runs until the first line that does not start with '|'
+    end = start
+    while end < len(content) and content.startswith('|', end):
+        newline = content.find('\n', end)
+        end = len(content) if newline == -1 else newline + 1
+    table = content[start:end].rstrip('\n')
+    return f"{content[:start]}<!-- START:{name} -->\n{table}\n<!-- END:{name} -->\n{content[end:]}"
+
+class ResponseCache:
+    """On-disk cache of GitHub API responses keyed by URL, revalidated with ETag/Last-Modified"""
+    
+    def __init__(self, cache_dir: str, max_age_hours: float = 168, max_size_mb: float = 50):
+        self.cache_dir = cache_dir
+        self.max_age = max_age_hours * 3600
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        
+        # Guards the index and entry files when repositories are processed concurrently
+        self._lock = threading.RLock()
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # key -> (size in bytes, last access time), rebuilt from disk on startup
+        self._index: Dict[str, Tuple[int, float]] = {}
+        for filename in os.listdir(cache_dir):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self._index[filename[:-5]] = (stat.st_size, stat.st_mtime)
+        
+        self.prune()
+    
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Build a stable cache key from URL and query parameters"""
+        query = '&'.join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached entry with body and validators, or None"""
+        with self._lock:
+            if key not in self._index:
+                return None
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            
+            if time.time() - entry.get('stored_at', 0) > self.max_age:
+                self._remove(key)
+                return None
+            return entry
+    
+    def put(self, key: str, url: str, body, etag: Optional[str], last_modified: Optional[str]):
+        """Store a freshly fetched response body together with its validators"""
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            entry = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'stored_at': time.time(),
+                'body': body
+            }
+            payload = json.dumps(entry)
+            try:
+                with open(self._path(key), 'w', encoding='utf-8') as f:
+                    f.write(payload)
+            except OSError as e:
+                logger.warning(f"Could not write cache entry for {url}: {e}")
+                return
+            self._index[key] = (len(payload), time.time())
+            
+            if sum(size for size, _ in self._index.values()) > self.max_size:
+                self.prune()
+    
+    def touch(self, key: str):
+        """Record a successful revalidation so the entry is not aged out"""
+        with self._lock:
+            self.hits += 1
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                entry['stored_at'] = time.time()
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+            except (OSError, ValueError):
+                return
+            size, _ = self._index.get(key, (0, 0))
+            self._index[key] = (size, time.time())
+    
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def prune(self):
+        """Evict expired entries, then least recently used ones until under the size limit"""
+        with self._lock:
+            now = time.time()
+            for key, (_, accessed) in list(self._index.items()):
+                if now - accessed > self.max_age:
+                    self._remove(key)
+            
+            total = sum(size for size, _ in self._index.values())
+            for key, (size, _) in sorted(self._index.items(), key=lambda x: x[1][1]):
+                if total <= self.max_size:
+                    break
+                self._remove(key)
+                total -= size
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._index.clear()
+        logger.info(f"Cleared response cache at {self.cache_dir}")
+
+class CommitStore:
+    """SQLite store of synced commit dates per repository, for incremental commit sync"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        # One connection shared by worker threads, serialized by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS commits ("
+                " repo TEXT NOT NULL, sha TEXT NOT NULL, authored_at REAL NOT NULL,"
+                " PRIMARY KEY (repo, sha))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS commits_repo_date ON commits (repo, authored_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                " repo TEXT PRIMARY KEY, newest_sha TEXT, newest_date TEXT, synced_at REAL NOT NULL)"
+            )
+    
+    def last_sync(self, repo: str) -> Optional[Tuple[str, str]]:
+        """Return (newest_sha, newest_date) recorded by the previous sync, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_sha, newest_date FROM sync_state WHERE repo = ?", (repo,)
+            ).fetchone()
+        return (row[0], row[1]) if row and row[1] else None
+    
+    def record_sync(self, repo: str, commits: List[Tuple[str, float]],
+                    newest: Optional[Tuple[str, str]], window_start: float):
+        """Insert new (sha, authored_at) pairs, advance the sync cursor and prune outside the window"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO commits (repo, sha, authored_at) VALUES (?, ?, ?)",
+                [(repo, sha, authored_at) for sha, authored_at in commits]
+            )
+            if newest:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (repo, newest_sha, newest_date, synced_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (repo, newest[0], newest[1], time.time())
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE sync_state SET synced_at = ? WHERE repo = ?", (time.time(), repo)
+                )
+            self._conn.execute(
+                "DELETE FROM commits WHERE repo = ? AND authored_at < ?", (repo, window_start)
+            )
+    
+    def count_since(self, repo: str, since: float) -> int:
+        """Number of stored commits authored at or after the given epoch time"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM commits WHERE repo = ? AND authored_at >= ?", (repo, since)
+            ).fetchone()
+        return row[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class RepoStateStore:
+    """JSON file of per-repository change markers and derived metrics from the previous run"""
+    
+    def __init__(self, path: str, load: bool = True):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = {}
+        if not load:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable repo state {path}: {e}")
+    
+    def get(self, repo: str) -> Optional[Dict]:
+        with self._lock:
+            return self._state.get(repo)
+    
+    def repositories(self, owner: str) -> List[str]:
+        """Names of the owner's repositories with stored state"""
+        prefix = f"{owner}/"
+        with self._lock:
+            return [key[len(prefix):] for key in self._state if key.startswith(prefix)]
+    
+    def unchanged(self, repo: str, repo_info: Dict) -> Optional[Dict]:
+        """Return the stored state if pushed_at and updated_at have not moved since it was recorded"""
+        state = self.get(repo)
+        if not state or not repo_info.get('pushed_at'):
+            return None
+        if state.get('pushed_at') != repo_info.get('pushed_at'):
+            return None
+        if state.get('updated_at') != repo_info.get('updated_at'):
+            return None
+        return state
+    
+    def update(self, repo: str, **values):
+        """Merge values into a repository's stored state"""
+        with self._lock:
+            self._state.setdefault(repo, {}).update(values)
+    
+    def save(self):
+        """Write the state file atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+        os.replace(tmp_path, self.path)
+
+class RunPlanner:
+    """Budget-aware ordering of repository fetches, with a checkpoint of completed snapshots"""
+    
+    def __init__(self, checkpoint_path: str, reserve: int = 100, save_interval: float = 30.0):
+        self.checkpoint_path = checkpoint_path
+        self.reserve = reserve
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+        
+        # repo key -> {'fetched_at': epoch, 'snapshot': RepoSnapshot.to_dict()}
+        self._completed: Dict[str, Dict] = {}
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                self._completed = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {checkpoint_path}: {e}")
+    
+    def estimate_cost(self, updater: 'GitHubRepoUpdater', repo_config: RepoConfig) -> float:
+        """Expected number of rate-limited requests to fetch one repository"""
+        if updater.backend == 'graphql':
+            return 1 / max(updater.graphql_batch_size, 1)
+        
+        key = updater._repo_key(repo_config.name)
+        cost = 0 if repo_config.name in updater.prefetched_info else 1
+        cost += 1  # languages
+        
+        if updater.activity_source == 'stats':
+            cost += 2  # usually one 202 before the statistics are ready
+        elif updater.commit_store and updater.commit_store.last_sync(key):
+            cost += 1
+        else:
+            # About three times the 30 day volume falls in the 90 day window, 100 commits per page
+            previous = self._completed.get(key, {}).get('snapshot', {})
+            cost += min(max(math.ceil(previous.get('commits_30d', 0) * 3 / 100), 1), 10)
+        return cost
+    
+    def priority(self, updater: 'GitHubRepoUpdater', repo_config: RepoConfig, position: int) -> float:
+        """Higher first: stale repositories, popular ones, and those listed earlier"""
+        entry = self._completed.get(updater._repo_key(repo_config.name))
+        if not entry:
+            return float('inf')
+        staleness_hours = (time.time() - entry.get('fetched_at', 0)) / 3600
+        stars = (updater.prefetched_info.get(repo_config.name) or entry['snapshot'].get('repo_info') or {}).get(
+            'stargazers_count', 0
+        )
+        return staleness_hours * (1 + math.log1p(stars)) + 1 / (position + 1)
+    
+    def plan(self, updater: 'GitHubRepoUpdater', repo_configs: List[RepoConfig],
+             budget: Optional[int]) -> Tuple[List[RepoConfig], List[RepoConfig]]:
+        """Split repositories into those to fetch now and those deferred to a later run"""
+        if budget is None:
+            return list(repo_configs), []
+        
+        ranked = sorted(
+            enumerate(repo_configs),
+            key=lambda item: self.priority(updater, item[1], item[0]),
+            reverse=True
+        )
+        
+        available = budget - self.reserve
+        estimated = 0.0
+        selected = set()
+        for position, repo_config in ranked:
+            cost = self.estimate_cost(updater, repo_config)
+            if estimated + cost > available:
+                continue
+            estimated += cost
+            selected.add(position)
+        
+        to_fetch = [config for i, config in enumerate(repo_configs) if i in selected]
+        deferred = [config for i, config in enumerate(repo_configs) if i not in selected]
+        logger.info(
+            f"Run plan: {len(to_fetch)} repositories (~{estimated:.0f} requests of {budget} remaining), "
+            f"{len(deferred)} deferred"
+        )
+        return to_fetch, deferred
+    
+    def repositories(self, owner: str) -> List[str]:
+        """Names of the owner's repositories in the checkpoint"""
+        prefix = f"{owner}/"
+        with self._lock:
+            return [key[len(prefix):] for key in self._completed if key.startswith(prefix)]
+    
+    def restore(self, updater: 'GitHubRepoUpdater', repo_config: RepoConfig) -> Optional[RepoSnapshot]:
+        """The last completed snapshot of a repository, if any"""
+        with self._lock:
+            entry = self._completed.get(updater._repo_key(repo_config.name))
+        if not entry:
+            return None
+        snapshot = RepoSnapshot.from_dict(repo_config, entry['snapshot'])
+        snapshot.restored = True
+        return snapshot
+    
+    def record(self, updater: 'GitHubRepoUpdater', snapshots: List[RepoSnapshot]):
+        """Checkpoint successfully fetched snapshots"""
+        now = time.time()
+        with self._lock:
+            for snapshot in snapshots:
+                if snapshot.ok:
+                    self._completed[updater._repo_key(snapshot.name)] = {
+                        'fetched_at': now, 'snapshot': snapshot.to_dict()
+                    }
+    
+    def checkpoint(self, updater: 'GitHubRepoUpdater', snapshot: RepoSnapshot):
+        """Record one finished snapshot, writing the checkpoint at most every save_interval seconds"""
+        self.record(updater, [snapshot])
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+    
+    def save(self):
+        """Write the checkpoint atomically"""
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._completed, f)
+            os.replace(tmp_path, self.checkpoint_path)
+            self._last_save = time.monotonic()
+
+class HistoryStore:
+    """Append-only metrics history: one binary column file per metric, read back through mmap"""
+    
+    COLUMNS = {
+        'timestamp': 'd', 'repo': 'i', 'stars': 'q', 'forks': 'q', 'open_issues': 'q',
+        'open_prs': 'q', 'commits_7d': 'q', 'commits_30d': 'q'
+    }
+    # Language bytes in long form: (history row, language id, bytes)
+    LANGUAGE_COLUMNS = {'language_row': 'q', 'language': 'i', 'language_bytes': 'q'}
+    SPARK_CHARS = '▁▂▃▄▅▆▇█'
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._names_path = os.path.join(directory, 'names.json')
+        try:
+            with open(self._names_path, 'r', encoding='utf-8') as f:
+                self._names = json.load(f)
+        except FileNotFoundError:
+            self._names = {'repos': [], 'languages': []}
+        self._ids = {kind: {name: i for i, name in enumerate(names)} for kind, names in self._names.items()}
+        
+        self._maps: List[mmap.mmap] = []
+        self._views: Dict[str, memoryview] = {}
+        self._rows_by_repo: Optional[Dict[int, List[int]]] = None
+        self._languages_by_row: Optional[Dict[int, List[int]]] = None
+    
+    def _path(self, column: str) -> str:
+        return os.path.join(self.directory, f'{column}.bin')
+    
+    def _map(self, column: str, typecode: str) -> memoryview:
+        path = self._path(column)
+        itemsize = array(typecode).itemsize
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        usable = size - size % itemsize
+        if not usable:
+            return memoryview(array(typecode))
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped)[:usable].cast(typecode)
+    
+    def _open(self):
+        """Map every column and index rows by repository; a no-op while already open"""
+        if self._views:
+            return
+        for column, typecode in {**self.COLUMNS, **self.LANGUAGE_COLUMNS}.items():
+            self._views[column] = self._map(column, typecode)
+        
+        # A run interrupted mid-append can leave columns of different lengths; trust only complete rows
+        rows = min(len(self._views[column]) for column in self.COLUMNS)
+        language_rows = min(len(self._views[column]) for column in self.LANGUAGE_COLUMNS)
+        
+        self._rows_by_repo = {}
+        for row, repo_id in enumerate(self._views['repo'][:rows]):
+            self._rows_by_repo.setdefault(repo_id, []).append(row)
+        self._languages_by_row = {}
+        for i, row in enumerate(self._views['language_row'][:language_rows]):
+            self._languages_by_row.setdefault(row, []).append(i)
+    
+    def close(self):
+        """Release the memory maps (they are reopened on the next read)"""
+        for view in self._views.values():
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views, self._maps = {}, []
+        self._rows_by_repo = self._languages_by_row = None
+    
+    def _id(self, kind: str, name: str) -> int:
+        ids = self._ids[kind]
+        if name not in ids:
+            ids[name] = len(self._names[kind])
+            self._names[kind].append(name)
+        return ids[name]
+    
+    def append(self, entries: List[Tuple[str, RepoSnapshot]], timestamp: Optional[float] = None):
+        """Record one row per fetched snapshot, keyed by repository key"""
+        timestamp = timestamp or time.time()
+        with self._lock:
+            self._open()
+            rows = min(len(self._views[column]) for column in self.COLUMNS)
+            language_rows = min(len(self._views[column]) for column in self.LANGUAGE_COLUMNS)
+            self.close()
+            
+            columns = {column: array(typecode) for column, typecode in self.COLUMNS.items()}
+            language_columns = {column: array(typecode) for column, typecode in self.LANGUAGE_COLUMNS.items()}
+            for key, snapshot in entries:
+                if not snapshot.ok:
+                    continue
+                repo_info = snapshot.repo_info
+                row = rows + len(columns['timestamp'])
+                columns['timestamp'].append(timestamp)
+                columns['repo'].append(self._id('repos', key))
+                columns['stars'].append(repo_info.get('stargazers_count', 0))
+                columns['forks'].append(repo_info.get('forks_count', 0))
+                # -1 marks counts that were not fetched; open_issues_count mixes issues with PRs
+                columns['open_issues'].append(snapshot.open_issues if snapshot.open_issues is not None else -1)
+                columns['open_prs'].append(snapshot.open_prs if snapshot.open_prs is not None else -1)
+                columns['commits_7d'].append(snapshot.commits_7d)
+                columns['commits_30d'].append(snapshot.commits_30d)
+                for language, size in snapshot.languages.items():
+                    language_columns['language_row'].append(row)
+                    language_columns['language'].append(self._id('languages', language))
+                    language_columns['language_bytes'].append(size)
+            
+            if not len(columns['timestamp']):
+                return
+            
+            # Names first, so every id written below resolves
+            tmp_path = f"{self._names_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._names, f)
+            os.replace(tmp_path, self._names_path)
+            
+            for group, count in ((columns, rows), (language_columns, language_rows)):
+                for column, values in group.items():
+                    with open(self._path(column), 'ab') as f:
+                        f.truncate(count * values.itemsize)
+                        f.write(values.tobytes())
+    
+    def series(self, repo_key: str, column: str, since: Optional[float] = None) -> List[Tuple[float, int]]:
+        """(timestamp, value) points of one metric for a repository, oldest first"""
+        repo_id = self._ids['repos'].get(repo_key)
+        if repo_id is None:
+            return []
+        with self._lock:
+            self._open()
+            timestamps, values = self._views['timestamp'], self._views[column]
+            return [
+                (timestamps[row], values[row]) for row in self._rows_by_repo.get(repo_id, [])
+                if since is None or timestamps[row] >= since
+            ]
+    
+    def language_bytes(self, repo_key: str) -> List[Tuple[float, Dict[str, int]]]:
+        """(timestamp, bytes per language) points for a repository, oldest first"""
+        repo_id = self._ids['repos'].get(repo_key)
+        if repo_id is None:
+            return []
+        languages = self._names['languages']
+        with self._lock:
+            self._open()
+            timestamps = self._views['timestamp']
+            language_ids, sizes = self._views['language'], self._views['language_bytes']
+            return [
+                (timestamps[row], {languages[language_ids[i]]: sizes[i] for i in self._languages_by_row.get(row, [])})
+                for row in self._rows_by_repo.get(repo_id, [])
+            ]
+    
+    def delta(self, repo_key: str, column: str, current: int, days: float) -> Optional[int]:
+        """Change of a metric over the last `days`, measured from the last value recorded before the window"""
+        start = time.time() - days * 86400
+        points = self.series(repo_key, column)
+        if not points:
+            return None
+        baseline = points[0][1]
+        for timestamp, value in points:
+            if timestamp > start:
+                break
+            baseline = value
+        return current - baseline
+    
+    @classmethod
+    def sparkline(cls, values: List[int]) -> str:
+        """Unicode block sparkline scaled between the minimum and maximum value"""
+        if not values:
+            return ''
+        low, high = min(values), max(values)
+        if high == low:
+            return cls.SPARK_CHARS[0] * len(values)
+        scale = (len(cls.SPARK_CHARS) - 1) / (high - low)
+        return ''.join(cls.SPARK_CHARS[int((value - low) * scale + 0.5)] for value in values)
+
+class RateLimiter:
+    """Header-driven rate limit tracker with token bucket pacing and rate-limit backoff"""
+    
+    def __init__(self, requests_per_second: float = 10, burst: int = 20, low_watermark: int = 100,
+                 max_retries: int = 5, max_wait: float = 3900):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.low_watermark = low_watermark
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        
+        # Budget per rate limit resource ('core', 'graphql', 'search', ...)
+        self.remaining: Dict[str, int] = {}
+        self.limit: Dict[str, int] = {}
+        self.reset: Dict[str, float] = {}
+        
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def update(self, headers, resource: str = 'core'):
+        """Record the budget reported by X-RateLimit-* response headers"""
+        resource = headers.get('X-RateLimit-Resource', resource)
+        try:
+            with self._lock:
+                if 'X-RateLimit-Remaining' in headers:
+                    self.remaining[resource] = int(headers['X-RateLimit-Remaining'])
+                if 'X-RateLimit-Limit' in headers:
+                    self.limit[resource] = int(headers['X-RateLimit-Limit'])
+                if 'X-RateLimit-Reset' in headers:
+                    self.reset[resource] = float(headers['X-RateLimit-Reset'])
+        except ValueError:
+            logger.debug(f"Ignoring malformed rate limit headers for {resource}")
+    
+    def _current_rate(self, resource: str) -> float:
+        """Requests per second allowed, slowing down to stretch a low budget until reset"""
+        remaining = self.remaining.get(resource)
+        if remaining is None or remaining >= self.low_watermark:
+            return self.requests_per_second
+        seconds_to_reset = max(self.reset.get(resource, time.time()) - time.time(), 1)
+        return max(min(self.requests_per_second, remaining / seconds_to_reset), 0.01)
+    
+    def acquire(self, resource: str = 'core'):
+        """Block until a request may be sent"""
+        # Budget exhausted: wait for the window to reset instead of failing
+        if self.remaining.get(resource) == 0:
+            wait = self.reset.get(resource, time.time()) - time.time() + 1
+            if wait > 0:
+                wait = min(wait, self.max_wait)
+                logger.warning(f"Rate limit for '{resource}' exhausted, sleeping {wait:.0f}s until reset")
+                time.sleep(wait)
+            with self._lock:
+                self.remaining.pop(resource, None)
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                rate = self._current_rate(resource)
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / rate
+            time.sleep(wait)
+    
+    def backoff_for(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if not retryable"""
+        if response.status_code not in (403, 429) or attempt >= self.max_retries:
+            return None
+        
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_wait)
+            except ValueError:
+                pass
+        
+        # Primary limit exhausted: sleep until the reported reset
+        if response.headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in response.headers:
+            try:
+                wait = float(response.headers['X-RateLimit-Reset']) - time.time() + 1
+                return min(max(wait, 1), self.max_wait)
+            except ValueError:
+                pass
+        
+        # Secondary rate limit: exponential backoff with jitter
+        if response.status_code == 429 or 'secondary rate limit' in response.text.lower():
+            return min(60 * 2 ** attempt, 900) * random.uniform(0.5, 1.5)
+        
+        # Plain permission error
+        return None
+
+class TokenPool:
+    """API tokens with one rate limiter each; requests go to the token with the most budget left"""
+    
+    def __init__(self, tokens: List[str], limiters: Optional[List[RateLimiter]] = None):
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self.tokens = list(tokens)
+        self.limiters = limiters or [RateLimiter() for _ in self.tokens]
+        if len(self.limiters) != len(self.tokens):
+            raise ValueError("TokenPool needs one rate limiter per token")
+    
+    def _budget(self, limiter: RateLimiter, resource: str) -> int:
+        remaining = limiter.remaining.get(resource)
+        if remaining is None or limiter.reset.get(resource, 0) < time.time():
+            # Unknown or already reset: assume the full hourly budget
+            return limiter.limit.get(resource, 5000)
+        return remaining
+    
+    def acquire(self, resource: str = 'core') -> Tuple[str, RateLimiter]:
+        """Pick the token with the most remaining budget for the resource"""
+        index = max(range(len(self.tokens)), key=lambda i: self._budget(self.limiters[i], resource))
+        return self.tokens[index], self.limiters[index]
+    
+    @property
+    def remaining(self) -> Dict[str, int]:
+        """Remaining budget per resource, summed over all tokens"""
+        totals: Dict[str, int] = {}
+        for limiter in self.limiters:
+            for resource, remaining in limiter.remaining.items():
+                totals[resource] = totals.get(resource, 0) + remaining
+        return totals
+    
+    @property
+    def reset(self) -> Dict[str, float]:
+        """Earliest budget reset per resource across all tokens"""
+        resets: Dict[str, float] = {}
+        for limiter in self.limiters:
+            for resource, reset in limiter.reset.items():
+                resets[resource] = min(resets.get(resource, reset), reset)
+        return resets
+
+@dataclass
+class TransportConfig:
+    """HTTP transport settings: connection pooling, timeouts and transient-error retries"""
+    pool_connections: int = 4
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: Tuple[int, ...] = (500, 502, 503, 504)
+    
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout for requests"""
+        return (self.connect_timeout, self.read_timeout)
+    
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter before retry number attempt + 1"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+def create_session(pool_size: int, user_agent: str = 'GitHub-Updater',
+                   transport: Optional[TransportConfig] = None) -> requests.Session:
+    """Create the HTTP session shared by every updater, with a connection pool sized for the workers"""
+    transport = transport or TransportConfig()
+    session = requests.Session()
+    session.headers.update({
+        'Accept': 'application/vnd.github.v3+json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'User-Agent': user_agent
+    })
+    # Retries are handled per attempt in GitHubRepoUpdater._send, so the adapter never retries on its own
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=transport.pool_connections, pool_maxsize=max(1, pool_size), max_retries=0
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+class RequestMetrics:
+    """Per-endpoint and per-repository request telemetry, exported as JSON and Prometheus text"""
+    
+    # Latency histogram bucket upper bounds, in seconds
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    def __init__(self):
+        self.started_at = time.time()
+        self.endpoints: Dict[str, Dict] = {}
+        self.repos: Dict[str, Dict] = {}
+        self.operations: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def classify(url: str) -> Tuple[str, Optional[str]]:
+        """Map a request URL to an endpoint label and the owner/repo it concerns"""
+        path = urlparse(url).path
+        match = re.match(r'^/repos/([^/]+)/([^/]+)(/.*)?$', path)
+        if match:
+            return f"/repos/:repo{match.group(3) or ''}", f"{match.group(1)}/{match.group(2)}"
+        return re.sub(r'^/(users|orgs)/[^/]+', r'/\1/:owner', path), None
+    
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {
+            'requests': 0, 'statuses': {}, 'retries': 0, 'transient_retries': 0, 'cache_hits': 0, 'bytes': 0,
+            'rate_limit_cost': 0, 'latency_sum': 0.0
+        }
+    
+    def _endpoint(self, endpoint: str) -> Dict:
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = dict(self._new_stats(), latency_buckets=[0] * len(self.BUCKETS))
+        return self.endpoints[endpoint]
+    
+    def _repo(self, repo: str) -> Dict:
+        if repo not in self.repos:
+            self.repos[repo] = self._new_stats()
+        return self.repos[repo]
+    
+    def record_request(self, url: str, status: Optional[int], latency: float, size: int,
+                       retry: Optional[str] = None):
+        """Record one HTTP attempt; status None means the connection failed, retry is 'rate_limit' or 'transient'"""
+        endpoint, repo = self.classify(url)
+        with self._lock:
+            endpoint_stats = self._endpoint(endpoint)
+            for i, bound in enumerate(self.BUCKETS):
+                if latency <= bound:
+                    endpoint_stats['latency_buckets'][i] += 1
+            
+            for stats in [endpoint_stats] + ([self._repo(repo)] if repo else []):
+                stats['requests'] += 1
+                status_key = str(status) if status is not None else 'error'
+                stats['statuses'][status_key] = stats['statuses'].get(status_key, 0) + 1
+                stats['bytes'] += size
+                stats['latency_sum'] += latency
+                # Conditional 304 responses are not charged against the rate limit
+                if status is not None and status != 304:
+                    stats['rate_limit_cost'] += 1
+                if retry == 'rate_limit':
+                    stats['retries'] += 1
+                elif retry == 'transient':
+                    stats['transient_retries'] += 1
+    
+    def record_cache_hit(self, url: str):
+        endpoint, repo = self.classify(url)
+        with self._lock:
+            self._endpoint(endpoint)['cache_hits'] += 1
+            if repo:
+                self._repo(repo)['cache_hits'] += 1
+    
+    def record_operation(self, operation: str, duration: float):
+        """Record the total duration of one high-level fetch (including pagination and retries)"""
+        with self._lock:
+            stats = self.operations.setdefault(operation, {'calls': 0, 'duration_sum': 0.0, 'duration_max': 0.0})
+            stats['calls'] += 1
+            stats['duration_sum'] += duration
+            stats['duration_max'] = max(stats['duration_max'], duration)
+    
+    def to_dict(self, budget: Optional[Dict[str, int]] = None) -> Dict:
+        """Machine-readable summary of the run"""
+        with self._lock:
+            data = {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+                'duration_seconds': round(time.time() - self.started_at, 3),
+                'buckets': list(self.BUCKETS),
+                'endpoints': json.loads(json.dumps(self.endpoints)),
+                'repos': json.loads(json.dumps(self.repos)),
+                'operations': json.loads(json.dumps(self.operations))
+            }
+        if budget is not None:
+            data['rate_limit_remaining'] = dict(budget)
+        return data
+    
+    def to_prometheus(self, budget: Optional[Dict[str, int]] = None) -> str:
+        """Render metrics in the Prometheus textfile exposition format"""
+        data = self.to_dict(budget)
+        prefix = 'github_updater'
+        lines = []
+        
+        def metric(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+        
+        def label(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"')
+        
+        metric('run_duration_seconds', 'gauge', 'Wall time of the last run')
+        lines.append(f"{prefix}_run_duration_seconds {data['duration_seconds']}")
+        
+        metric('request_duration_seconds', 'histogram', 'GitHub API request latency per endpoint')
+        for endpoint, stats in data['endpoints'].items():
+            for bound, count in zip(self.BUCKETS, stats['latency_buckets']):
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{endpoint="{label(endpoint)}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{endpoint="{label(endpoint)}",le="+Inf"}} {stats["requests"]}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{endpoint="{label(endpoint)}"}} {stats["latency_sum"]:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{endpoint="{label(endpoint)}"}} {stats["requests"]}')
+        
+        metric('requests_total', 'counter', 'GitHub API requests by endpoint and status')
+        for endpoint, stats in data['endpoints'].items():
+            for status, count in stats['statuses'].items():
+                lines.append(f'{prefix}_requests_total{{endpoint="{label(endpoint)}",status="{status}"}} {count}')
+        
+        for name, key, help_text in (
+            ('retries_total', 'retries', 'Requests retried after a rate limit response'),
+            ('transient_retries_total', 'transient_retries', 'Requests retried after a 5xx response or connection error'),
+            ('cache_hits_total', 'cache_hits', 'Responses served from the cache after a 304'),
+            ('response_bytes_total', 'bytes', 'Response body bytes received'),
+            ('rate_limit_cost_total', 'rate_limit_cost', 'Requests charged against the rate limit')
+        ):
+            metric(name, 'counter', help_text)
+            for endpoint, stats in data['endpoints'].items():
+                lines.append(f'{prefix}_{name}{{endpoint="{label(endpoint)}"}} {stats[key]}')
+        
+        metric('repo_requests_total', 'counter', 'GitHub API requests per repository and status')
+        for repo, stats in data['repos'].items():
+            for status, count in stats['statuses'].items():
+                lines.append(f'{prefix}_repo_requests_total{{repo="{label(repo)}",status="{status}"}} {count}')
+        
+        for name, key, help_text in (
+            ('repo_retries_total', 'retries', 'Requests retried after a rate limit response per repository'),
+            ('repo_transient_retries_total', 'transient_retries',
+             'Requests retried after a 5xx response or connection error per repository'),
+            ('repo_cache_hits_total', 'cache_hits', 'Responses served from the cache after a 304 per repository'),
+            ('repo_response_bytes_total', 'bytes', 'Response body bytes received per repository'),
+            ('repo_rate_limit_cost_total', 'rate_limit_cost', 'Requests charged against the rate limit per repository')
+        ):
+            metric(name, 'counter', help_text)
+            for repo, stats in data['repos'].items():
+                lines.append(f'{prefix}_{name}{{repo="{label(repo)}"}} {stats[key]}')
+        
+        metric('repo_request_duration_seconds_total', 'counter', 'Time spent in requests per repository')
+        for repo, stats in data['repos'].items():
+            lines.append(f'{prefix}_repo_request_duration_seconds_total{{repo="{label(repo)}"}} {stats["latency_sum"]:.6f}')
+        
+        metric('operation_duration_seconds_total', 'counter', 'Time spent per fetch operation')
+        for operation, stats in data['operations'].items():
+            lines.append(f'{prefix}_operation_duration_seconds_total{{operation="{label(operation)}"}} {stats["duration_sum"]:.6f}')
+        
+        if 'rate_limit_remaining' in data:
+            metric('rate_limit_remaining', 'gauge', 'Rate limit budget remaining per resource')
+            for resource, remaining in data['rate_limit_remaining'].items():
+                lines.append(f'{prefix}_rate_limit_remaining{{resource="{label(resource)}"}} {remaining}')
+        
+        return "\n".join(lines) + "\n"
+    
+    def export(self, json_path: str, prometheus_path: str, budget: Optional[Dict[str, int]] = None):
+        """Write the JSON and Prometheus textfile exports"""
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(budget), f, indent=2)
+        
+        # Write then rename so a node_exporter scrape never sees a partial file
+        tmp_path = f"{prometheus_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(budget))
+        os.replace(tmp_path, prometheus_path)
+
+class SnapshotExporter:
+    """Writes a run's per-repository data as JSON, CSV and a standalone HTML page"""
+    
+    FIELDS = [
+        'account', 'repository', 'display_name', 'url', 'fetched', 'status', 'primary_language',
+        'stars', 'forks', 'open_issues', 'closed_issues', 'open_prs', 'closed_prs', 'open_issues_and_prs',
+        'commits_7d', 'commits_30d', 'last_commit_date', 'archived'
+    ]
+    FORMATS = ('json', 'csv', 'html')
+    
+    def __init__(self, output_dir: str = 'exports', formats: Optional[List[str]] = None):
+        self.output_dir = output_dir
+        self.formats = [fmt for fmt in (formats or self.FORMATS) if fmt in self.FORMATS]
+    
+    @staticmethod
+    def record(account: str, snapshot: RepoSnapshot) -> Dict:
+        """Flat export record for one snapshot; values are None when the repository was not fetched"""
+        repo_info = snapshot.repo_info or {}
+        return {
+            'account': account,
+            'repository': snapshot.name,
+            'display_name': snapshot.config.display_name or snapshot.name,
+            'url': repo_info.get('html_url') or f'https://github.com/{account}/{snapshot.name}',
+            'fetched': snapshot.ok,
+            'status': snapshot.status.value if snapshot.status else None,
+            'primary_language': snapshot.primary_language if snapshot.ok else None,
+            'stars': repo_info.get('stargazers_count'),
+            'forks': repo_info.get('forks_count'),
+            'open_issues': snapshot.open_issues,
+            'closed_issues': snapshot.closed_issues,
+            'open_prs': snapshot.open_prs,
+            'closed_prs': snapshot.closed_prs,
+            # GitHub's open_issues_count includes open pull requests
+            'open_issues_and_prs': repo_info.get('open_issues_count'),
+            'commits_7d': snapshot.commits_7d if snapshot.ok else None,
+            'commits_30d': snapshot.commits_30d if snapshot.ok else None,
+            'last_commit_date': snapshot.last_commit_date or repo_info.get('pushed_at'),
+            'archived': repo_info.get('archived')
+        }
+    
+    def to_csv(self, records: List[Dict]) -> str:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(records)
+        return buffer.getvalue()
+    
+    def to_html(self, records: List[Dict], generated_at: str) -> str:
+        status_colors = {
+            status.value: BadgeRenderer.COLORS[color] for status, color in GitHubRepoUpdater.STATUS_COLORS.items()
+        }
+        columns = [
+            ('Repository', 'display_name'), ('Status', 'status'), ('Language', 'primary_language'),
+            ('Stars', 'stars'), ('Forks', 'forks'), ('Open Issues', 'open_issues'), ('Open PRs', 'open_prs'),
+            ('Commits (7d)', 'commits_7d'), ('Commits (30d)', 'commits_30d'), ('Last Commit', 'last_commit_date')
+        ]
+        
+        rows = []
+        for record in records:
+            cells = []
+            for _, key in columns:
+                value = record[key]
+                text = html.escape('' if value is None else str(value))
+                if key == 'display_name':
+                    text = f'<a href="{html.escape(record["url"])}">{text}</a>'
+                elif key == 'status' and value:
+                    text = f'<span class="status" style="background:{status_colors.get(value, "#555")}">{text}</span>'
+                elif key == 'last_commit_date' and value:
+                    text = text[:10]
+                cells.append(f'<td>{text}</td>')
+            rows.append(f'<tr>{"".join(cells)}</tr>')
+        
+        header = ''.join(f'<th>{html.escape(title)}</th>' for title, _ in columns)
+        return (
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            '<title>Repository Status</title>\n<style>\n'
+            'body{font-family:-apple-system,Segoe UI,Helvetica,Arial,sans-serif;margin:2em;color:#24292f}\n'
+            'table{border-collapse:collapse}th,td{padding:6px 12px;border-bottom:1px solid #d0d7de;text-align:left}\n'
+            'th{background:#f6f8fa}.status{color:#fff;border-radius:3px;padding:2px 6px;font-size:.85em}\n'
+            '</style>\n</head>\n<body>\n<h1>Repository Status</h1>\n'
+            f'<p>Generated {html.escape(generated_at)}</p>\n'
+            f'<table>\n<thead><tr>{header}</tr></thead>\n<tbody>\n' + '\n'.join(rows) + '\n</tbody>\n</table>\n'
+            '</body>\n</html>\n'
+        )
+    
+    def _write(self, filename: str, content: str):
+        path = os.path.join(self.output_dir, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    
+    def export(self, entries: List[Tuple[str, RepoSnapshot]]) -> bool:
+        """Write every configured format; skipped (returns False) when the data and formats match the last export"""
+        records = [self.record(account, snapshot) for account, snapshot in entries]
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # The digest covers the records and the selected formats, so adding a format forces a write
+        digest = hashlib.sha256(json.dumps([records, sorted(self.formats)], sort_keys=True).encode()).hexdigest()
+        digest_path = os.path.join(self.output_dir, '.export_digest')
+        files = [os.path.join(self.output_dir, f'repositories.{fmt}') for fmt in self.formats]
+        try:
+            with open(digest_path, 'r', encoding='utf-8') as f:
+                if f.read().strip() == digest and all(os.path.exists(path) for path in files):
+                    return False
+        except OSError:
+            pass
+        
+        generated_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        if 'json' in self.formats:
+            self._write('repositories.json', json.dumps(
+                {'generated_at': generated_at, 'fields': self.FIELDS, 'repositories': records}, indent=2
+            ) + '\n')
+        if 'csv' in self.formats:
+            self._write('repositories.csv', self.to_csv(records))
+        if 'html' in self.formats:
+            self._write('repositories.html', self.to_html(records, generated_at))
+        
+        # Digest last, so an interrupted export is redone next run
+        self._write('.export_digest', digest + '\n')
+        return True
+
+class BadgeRenderer:
+    """Static flat-style SVG badges, written once per distinct content under content-hashed names"""
+    
+    COLORS = {
+        'brightgreen': '#4c1', 'green': '#97ca00', 'yellow': '#dfb317', 'orange': '#fe7d37',
+        'red': '#e05d44', 'blue': '#007ec6', 'lightgray': '#9f9f9f', 'gray': '#555'
+    }
+    
+    def __init__(self, badge_dir: str = 'badges', url_prefix: Optional[str] = None):
+        self.badge_dir = badge_dir
+        self.url_prefix = (url_prefix if url_prefix is not None else badge_dir).rstrip('/')
+        self.written = 0
+        self._lock = threading.Lock()
+        os.makedirs(badge_dir, exist_ok=True)
+    
+    @staticmethod
+    def _text_width(text: str) -> int:
+        """Approximate width of 11px Verdana text"""
+        width = 0.0
+        for char in text:
+            if char in 'fijlrtI.,:;|!\' ':
+                width += 3.8
+            elif char in 'mwMW@%':
+                width += 9.8
+            elif char.isupper() or char.isdigit():
+                width += 7.5
+            else:
+                width += 6.6
+        return int(width + 0.5)
+    
+    def _color(self, color: str) -> str:
+        color = self.COLORS.get(color, color)
+        return color if color.startswith('#') else f'#{color}'
+    
+    def _text_color(self, color: str) -> str:
+        """Dark text on light backgrounds, white otherwise"""
+        hex_digits = color.lstrip('#')
+        if len(hex_digits) == 3:
+            hex_digits = ''.join(c * 2 for c in hex_digits)
+        red, green, blue = (int(hex_digits[i:i + 2], 16) for i in (0, 2, 4))
+        return '#333' if (0.299 * red + 0.587 * green + 0.114 * blue) > 186 else '#fff'
+    
+    def render(self, label: str, message: str, color: str) -> str:
+        """SVG for a two-part badge, or a single-part one when label is empty"""
+        color = self._color(color)
+        label_width = self._text_width(label) + 10 if label else 0
+        message_width = self._text_width(message) + 10
+        width = label_width + message_width
+        title = html.escape(f'{label}: {message}' if label else message)
+        
+        texts = []
+        if label:
+            texts.append(f'<text x="{label_width / 2:g}" y="14" fill="#fff">{html.escape(label)}</text>')
+        texts.append(
+            f'<text x="{label_width + message_width / 2:g}" y="14" fill="{self._text_color(color)}">'
+            f'{html.escape(message)}</text>'
+        )
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="20" role="img" aria-label="{title}">'
+            f'<title>{title}</title>'
+            f'<clipPath id="r"><rect width="{width}" height="20" rx="3" fill="#fff"/></clipPath>'
+            f'<g clip-path="url(#r)"><rect width="{label_width}" height="20" fill="#555"/>'
+            f'<rect x="{label_width}" width="{message_width}" height="20" fill="{color}"/></g>'
+            f'<g text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" font-size="11">'
+            f'{"".join(texts)}</g></svg>'
+        )
+    
+    def badge(self, alt: str, label: str, message: str, color: str) -> str:
+        """Write the badge if no identical one exists yet and return its markdown image"""
+        svg = self.render(label, message, color)
+        filename = f"{hashlib.sha256(svg.encode()).hexdigest()[:16]}.svg"
+        path = os.path.join(self.badge_dir, filename)
+        
+        with self._lock:
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(svg)
+                os.replace(tmp_path, path)
+                self.written += 1
+        return f'![{alt}]({self.url_prefix}/{filename})'
+    
+    BADGE_NAME = re.compile(r'[0-9a-f]{16}\.svg')
+    
+    def _referenced(self, content: str) -> set:
+        return set(re.findall(rf'{re.escape(self.url_prefix)}/({self.BADGE_NAME.pattern})', content))
+    
+    def available(self, content: str) -> bool:
+        """Whether every badge referenced in content exists on disk"""
+        return all(os.path.exists(os.path.join(self.badge_dir, name)) for name in self._referenced(content))
+    
+    def prune(self, content: str) -> int:
+        """Delete this renderer's badge files no longer referenced in content; returns the number removed"""
+        referenced = self._referenced(content)
+        removed = 0
+        for name in os.listdir(self.badge_dir):
+            # Only content-hashed names are ours; the directory may hold other images
+            if self.BADGE_NAME.fullmatch(name) and name not in referenced:
+                os.remove(os.path.join(self.badge_dir, name))
+                removed += 1
+        return removed
+
+def _timed(operation: str):
+    """Record the duration of an updater method in its metrics"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics.record_operation(operation, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
 class GitHubRepoUpdater:
     """Enhanced GitHub repository status updater"""
     
-    def __init__(self, username: str, token: str):
+    def __init__(self, username: str, token: str, cache: Optional[ResponseCache] = None,
+                 max_workers: int = 1, backend: str = 'rest', graphql_batch_size: int = 25,
+                 rate_limiter: Optional[RateLimiter] = None, commit_store: Optional[CommitStore] = None,
+                 repo_state: Optional[RepoStateStore] = None, activity_source: str = 'commits',
+                 api_base: str = 'https://api.github.com', token_pool: Optional[TokenPool] = None,
+                 session: Optional[requests.Session] = None, metrics: Optional['RequestMetrics'] = None,
+                 planner: Optional[RunPlanner] = None, badges: Optional[BadgeRenderer] = None,
+                 history: Optional[HistoryStore] = None, trend_days: Optional[int] = None,
+                 transport: Optional[TransportConfig] = None):
         self.username = username
         self.token = token
-        self.headers = {
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'User-Agent': f'GitHub-Updater/{username}'
-        }
-        self.api_base = 'https://api.github.com'
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.api_base = api_base.rstrip('/')
+        
+        # Concurrency: the session is shared by all workers (and accounts), so size its pool to match
+        self.max_workers = max(1, max_workers)
+        self.transport = transport or TransportConfig()
+        self.session = session or create_session(self.max_workers, f'GitHub-Updater/{username}', self.transport)
         
-        # Rate limiting
-        self.rate_limit_remaining = None
-        self.rate_limit_reset = None
+        # Tokens and their rate limiters, fed from response headers
+        self.token_pool = token_pool or TokenPool([token], [rate_limiter or RateLimiter()])
+        
+        # Conditional request cache (None disables it)
+        self.cache = cache
+        
+        # Incremental commit sync (None re-pages the full window every run)
+        self.commit_store = commit_store
+        
+        # Change detection between runs (None fetches every repository in full)
+        self.repo_state = repo_state
+        
+        # Budget planning and checkpointing (None fetches everything, whatever the budget)
+        self.planner = planner
+        
+        # Local SVG badges (None links live shields.io badges)
+        self.badges = badges
+        
+        # Metrics history; trend columns are shown when trend_days is set
+        self.history = history
+        self.trend_days = trend_days if history else None
+        
+        # Activity source: 'commits' (paged commit lists) or 'stats' (weekly statistics endpoint)
+        if activity_source not in ('commits', 'stats'):
+            raise ValueError(f"Unknown activity source: {activity_source}")
+        self.activity_source = activity_source
+        self.stats_max_polls = 4
+        self.stats_poll_delay = 2.0
+        
+        # Snapshots whose statistics answered 202 during a batch fetch, re-polled together afterwards
+        self._pending_stats: Optional[List[RepoSnapshot]] = None
+        
+        # Per-run bookkeeping
+        self.metrics = metrics or RequestMetrics()
+        self.request_count = 0
+        self._user_info: Optional[Dict] = None
+        self._stats_lock = threading.Lock()
+        
+        # Repository info already returned by a bulk listing, keyed by repo name
+        self.prefetched_info: Dict[str, Dict] = {}
+        
+        # Fetch backend: 'rest' (per-repo endpoints) or 'graphql' (batched queries)
+        if backend not in ('rest', 'graphql'):
+            raise ValueError(f"Unknown fetch backend: {backend}")
+        self.backend = backend
+        self.graphql_batch_size = graphql_batch_size
         
         logger.info(f"Initialized GitHubRepoUpdater for user: {username}")
     
-    def _check_rate_limit(self) -> bool:
-        """Check GitHub API rate limit"""
-        try:
-            response = self.session.get(f'{self.api_base}/rate_limit')
-            response.raise_for_status()
-            data = response.json()
+    @property
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Core API requests remaining across all tokens, as last reported by GitHub"""
+        return self.token_pool.remaining.get('core')
+    
+    @property
+    def rate_limit_reset(self) -> Optional[datetime]:
+        """When the core API budget resets"""
+        reset = self.token_pool.reset.get('core')
+        return datetime.fromtimestamp(reset) if reset else None
+    
+    def _repo_key(self, repo_name: str) -> str:
+        """Key for per-repository state shared between accounts"""
+        return f"{self.username}/{repo_name}"
+    
+    def refresh_budget(self, resource: str = 'core') -> Optional[int]:
+        """Query /rate_limit (which is not itself rate limited) for every token and return the total"""
+        total = 0
+        for token, limiter in zip(self.token_pool.tokens, self.token_pool.limiters):
+            try:
+                response = self.session.get(
+                    f'{self.api_base}/rate_limit', headers={'Authorization': f'token {token}'},
+                    timeout=self.transport.timeout
+                )
+                response.raise_for_status()
+                limit = response.json()['resources'][resource]
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning(f"Could not read rate limit budget: {e}")
+                return None
+            limiter.update({
+                'X-RateLimit-Remaining': limit['remaining'],
+                'X-RateLimit-Limit': limit['limit'],
+                'X-RateLimit-Reset': limit['reset']
+            }, resource)
+            total += limit['remaining']
+        return total
+    
+    def _send(self, method: str, url: str, resource: str = 'core', idempotent: Optional[bool] = None,
+              **kwargs) -> requests.Response:
+        """Send a request paced by the rate limiter, waiting out rate limits and retrying transient failures"""
+        headers = dict(kwargs.pop('headers', None) or {})
+        if idempotent is None:
+            idempotent = method in ('GET', 'HEAD')
+        attempt = 0
+        transient_attempt = 0
+        retry = None  # why the next attempt repeats the previous one, for the metrics
+        while True:
+            # Re-pick the token on every attempt so a throttled token hands over to another
+            token, limiter = self.token_pool.acquire(resource)
+            headers['Authorization'] = f'token {token}'
+            limiter.acquire(resource)
+            with self._stats_lock:
+                self.request_count += 1
             
-            core_limit = data['resources']['core']
-            self.rate_limit_remaining = core_limit['remaining']
-            self.rate_limit_reset = datetime.fromtimestamp(core_limit['reset'])
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=self.transport.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                elapsed = time.perf_counter() - start
+                self.metrics.record_request(url, None, elapsed, 0, retry=retry)
+                if not idempotent or transient_attempt >= self.transport.max_retries:
+                    raise
+                wait = self.transport.backoff(transient_attempt)
+                transient_attempt += 1
+                logger.warning(
+                    f"{method} {url} failed after {elapsed * 1000:.0f}ms ({type(e).__name__}), "
+                    f"retry {transient_attempt}/{self.transport.max_retries} in {wait:.1f}s"
+                )
+                retry = 'transient'
+                time.sleep(wait)
+                continue
+            except requests.RequestException:
+                self.metrics.record_request(url, None, time.perf_counter() - start, 0, retry=retry)
+                raise
             
-            logger.info(f"Rate limit: {self.rate_limit_remaining} requests remaining")
+            elapsed = time.perf_counter() - start
+            self.metrics.record_request(url, response.status_code, elapsed, len(response.content), retry=retry)
+            limiter.update(response.headers, resource)
+            logger.debug(
+                f"{method} {url} attempt {attempt + transient_attempt + 1}: "
+                f"HTTP {response.status_code} in {elapsed * 1000:.0f}ms"
+            )
             
-            if self.rate_limit_remaining < 10:
-                logger.warning(f"Low rate limit: {self.rate_limit_remaining} requests remaining")
-                return False
-            return True
+            if (response.status_code in self.transport.retry_statuses and idempotent
+                    and transient_attempt < self.transport.max_retries):
+                wait = self.transport.backoff(transient_attempt)
+                transient_attempt += 1
+                logger.warning(
+                    f"HTTP {response.status_code} on {url} after {elapsed * 1000:.0f}ms, "
+                    f"retry {transient_attempt}/{self.transport.max_retries} in {wait:.1f}s"
+                )
+                retry = 'transient'
+                time.sleep(wait)
+                continue
             
-        except Exception as e:
-            logger.error(f"Error checking rate limit: {e}")
-            return True  # Continue if rate limit check fails
+            wait = limiter.backoff_for(response, attempt)
+            if wait is None:
+                return response
+            
+            attempt += 1
+            logger.warning(f"Rate limited on {url} (HTTP {response.status_code}), retrying in {wait:.0f}s")
+            retry = 'rate_limit'
+            time.sleep(wait)
     
     def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """Make authenticated request to GitHub API with error handling"""
+        return self._request_json(url, params)[1]
+    
+    def _request_json(self, url: str, params: Optional[Dict] = None) -> Tuple[Optional[int], Optional[Dict]]:
+        """Make a GET request, returning (status code, parsed body or None)"""
+        cache_key = None
+        cached = None
+        headers = {}
+        if self.cache:
+            cache_key = ResponseCache.make_key(url, params)
+            cached = self.cache.get(cache_key)
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+        
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._send('GET', url, params=params, headers=headers)
+            
+            # 304 responses do not count against the rate limit
+            if response.status_code == 304 and cached:
+                self.metrics.record_cache_hit(url)
+                self.cache.touch(cache_key)
+                return 200, cached['body']
+            
             response.raise_for_status()
-            return response.json()
+            
+            # 202 means GitHub is still computing the result; 204 means there is nothing to return
+            if response.status_code in (202, 204):
+                return response.status_code, None
+            
+            data = response.json()
+            
+            if self.cache:
+                self.cache.put(
+                    cache_key, url, data,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
+            return response.status_code, data
         except requests.exceptions.Timeout:
             logger.error(f"Timeout error for URL: {url}")
-            return None
+            return None, None
         except requests.exceptions.HTTPError as e:
             if response.status_code == 404:
                 logger.warning(f"Resource not found: {url}")
@@ -102,16 +1566,191 @@ class GitHubRepoUpdater:
                 logger.error(f"Rate limit or permission error: {url}")
             else:
                 logger.error(f"HTTP error {response.status_code} for URL: {url}")
-            return None
+            return response.status_code, None
         except requests.RequestException as e:
             logger.error(f"Request error for URL {url}: {e}")
+            return None, None
+    
+    def _make_graphql_request(self, query: str, variables: Dict) -> Optional[Dict]:
+        """POST a GraphQL query, returning the data object (possibly partial)"""
+        url = f'{self.api_base}/graphql'
+        try:
+            # Queries only read, so a POST can be retried like a GET
+            response = self._send(
+                'POST', url, resource='graphql', idempotent=True, json={'query': query, 'variables': variables}
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except requests.exceptions.Timeout:
+            logger.error("Timeout error for GraphQL query")
+            return None
+        except requests.RequestException as e:
+            logger.error(f"GraphQL request error: {e}")
             return None
+        
+        for error in payload.get('errors') or []:
+            logger.warning(f"GraphQL error: {error.get('message')}")
+        return payload.get('data')
     
+    def _graphql_batches(self, repo_names: List[str], fragment_name: str, fragments: str,
+                         extra_variables: Optional[Dict[str, Tuple[str, str]]] = None,
+                         batch_size: int = 25) -> Dict[str, Dict]:
+        """Run one aliased repository() query per batch of repos, returning raw nodes by repo name"""
+        extra_variables = extra_variables or {}
+        results = {}
+        
+        for start in range(0, len(repo_names), batch_size):
+            batch = repo_names[start:start + batch_size]
+            
+            # One aliased repository() selection per repo, names passed as variables
+            declarations = ['$owner: String!'] + [
+                f'${name}: {graphql_type}' for name, (graphql_type, _) in extra_variables.items()
+            ]
+            selections = []
+            variables = {'owner': self.username}
+            variables.update({name: value for name, (_, value) in extra_variables.items()})
+            for i, name in enumerate(batch):
+                declarations.append(f'$n{i}: String!')
+                selections.append(f'  r{i}: repository(owner: $owner, name: $n{i}) {{ ...{fragment_name} }}')
+                variables[f'n{i}'] = name
+            query = (
+                f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}\n"
+                + fragments
+            )
+            
+            data = self._make_graphql_request(query, variables)
+            if not data:
+                logger.warning(f"GraphQL batch failed for {len(batch)} repositories")
+                continue
+            
+            for i, name in enumerate(batch):
+                node = data.get(f'r{i}')
+                if node:
+                    results[name] = node
+                else:
+                    logger.warning(f"GraphQL returned no data for {name}")
+        
+        return results
+    
+    @_timed('graphql_repos')
+    def fetch_repos_graphql(self, repo_names: List[str], batch_size: int = 25) -> Dict[str, Dict]:
+        """Fetch repo info, languages, issue/PR counts and commit activity for many repos in batched queries"""
+        now = datetime.utcnow()
+        nodes = self._graphql_batches(
+            repo_names, 'RepoFields', GRAPHQL_REPO_FRAGMENT + GRAPHQL_COUNTS_FRAGMENT,
+            extra_variables={
+                'since7': ('GitTimestamp!', (now - timedelta(days=7)).strftime('%Y-%m-%dT%H:%M:%SZ')),
+                'since30': ('GitTimestamp!', (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%SZ'))
+            },
+            batch_size=batch_size
+        )
+        results = {name: self._normalize_graphql_repo(node) for name, node in nodes.items()}
+        
+        logger.info(f"Fetched {len(results)}/{len(repo_names)} repositories via GraphQL")
+        return results
+    
+    @_timed('issue_pr_counts')
+    def get_issue_pr_counts(self, repo_names: List[str], batch_size: int = 50) -> Dict[str, Dict[str, int]]:
+        """Get exact open/closed issue and pull request totals for many repos in batched queries"""
+        nodes = self._graphql_batches(repo_names, 'CountFields', GRAPHQL_COUNTS_FRAGMENT, batch_size=batch_size)
+        return {name: self._normalize_counts(node) for name, node in nodes.items()}
+    
+    def _normalize_counts(self, node: Dict) -> Dict[str, int]:
+        """Extract issue/PR totals from a GraphQL node carrying CountFields"""
+        def total(key: str) -> int:
+            return (node.get(key) or {}).get('totalCount', 0)
+        
+        return {
+            'open_issues': total('openIssues'),
+            'closed_issues': total('closedIssues'),
+            'open_prs': total('openPullRequests'),
+            'closed_prs': total('closedPullRequests')
+        }
+    
+    def _normalize_graphql_repo(self, node: Dict) -> Dict:
+        """Convert a GraphQL repository node into the REST-shaped data used by the updater"""
+        target = (node.get('defaultBranchRef') or {}).get('target') or {}
+        latest = (target.get('latest') or {}).get('nodes') or []
+        
+        data = {
+            'repo_info': {
+                'name': node['name'],
+                'stargazers_count': node.get('stargazerCount', 0),
+                'forks_count': node.get('forkCount', 0),
+                'archived': node.get('isArchived', False),
+                'updated_at': node.get('updatedAt'),
+                'pushed_at': node.get('pushedAt')
+            },
+            'languages': {
+                edge['node']['name']: edge['size']
+                for edge in (node.get('languages') or {}).get('edges', [])
+            },
+            'commits_7d': (target.get('recent7') or {}).get('totalCount', 0),
+            'commits_30d': (target.get('recent30') or {}).get('totalCount', 0),
+            'last_commit_date': latest[0]['committedDate'] if latest else None
+        }
+        data.update(self._normalize_counts(node))
+        return data
+    
+    @_timed('discover')
+    def discover_repositories(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                              include_forks: bool = False, include_archived: bool = True) -> List[RepoConfig]:
+        """List the account's repositories through the paginated repos endpoint and prefetch their info"""
+        user_data = self.get_user_info() or {}
+        if user_data.get('type') == 'Organization':
+            url = f'{self.api_base}/orgs/{self.username}/repos'
+            params = {'type': 'all'}
+        else:
+            url = f'{self.api_base}/users/{self.username}/repos'
+            params = {'type': 'owner'}
+        
+        def selected(name: str) -> bool:
+            if include and not any(fnmatch.fnmatch(name, pattern) for pattern in include):
+                return False
+            return not (exclude and any(fnmatch.fnmatch(name, pattern) for pattern in exclude))
+        
+        repo_configs = []
+        listed = 0
+        
+        try:
+            for repo in self._iter_pages(url, params, strict=True):
+                listed += 1
+                name = repo['name']
+                if not selected(name):
+                    continue
+                if repo.get('fork') and not include_forks:
+                    continue
+                if repo.get('archived') and not include_archived:
+                    continue
+                
+                # The listing carries the same fields as /repos/{owner}/{repo}
+                self.prefetched_info[name] = repo
+                repo_configs.append(RepoConfig(name=name))
+        except PaginationError as e:
+            # A truncated listing would silently drop every repository after the failed page
+            previous = self.previous_repositories()
+            logger.error(
+                f"Repository listing for {self.username} incomplete ({e}); "
+                f"using the {len(previous)} repositories from earlier runs"
+            )
+            return [RepoConfig(name=name) for name in previous if selected(name)]
+        
+        logger.info(f"Discovered {len(repo_configs)} of {listed} repositories for {self.username}")
+        return repo_configs
+    
+    def previous_repositories(self) -> List[str]:
+        """Repository names this account had in earlier runs, from the checkpoint and repo state"""
+        names = self.planner.repositories(self.username) if self.planner else []
+        if self.repo_state:
+            names += [name for name in self.repo_state.repositories(self.username) if name not in names]
+        return names
+    
+    @_timed('repo_info')
     def get_repo_info(self, repo_name: str) -> Optional[Dict]:
         """Fetch comprehensive repository information"""
-        if not self._check_rate_limit():
-            return None
-            
+        if repo_name in self.prefetched_info:
+            return self.prefetched_info[repo_name]
+        
         url = f'{self.api_base}/repos/{self.username}/{repo_name}'
         data = self._make_request(url)
         
@@ -122,24 +1761,21 @@ class GitHubRepoUpdater:
             
         return data
     
-    def get_repo_commits(self, repo_name: str, days: int = 30) -> List[Dict]:
-        """Get recent commits with pagination support"""
-        since_date = (datetime.now() - timedelta(days=days)).isoformat()
-        url = f'{self.api_base}/repos/{self.username}/{repo_name}/commits'
-        params = {
-            'since': since_date,
-            'per_page': 100,
-            'page': 1
-        }
-        
-        all_commits = []
+    def _iter_pages(self, url: str, params: Optional[Dict] = None, max_pages: Optional[int] = None,
+                    strict: bool = False) -> Iterator[Dict]:
+        """Stream items from a paginated list endpoint, 100 per page; a failed page ends it (or raises if strict)"""
+        params = dict(params or {}, per_page=100, page=1)
         
         while True:
-            data = self._make_request(url, params)
+            status, data = self._request_json(url, params)
+            if status is None or status >= 400:
+                if strict:
+                    raise PaginationError(f"Page {params['page']} of {url} failed")
+                break
             if not data:
                 break
-                
-            all_commits.extend(data)
+            
+            yield from data
             
             # Check if there are more pages
             if len(data) < 100:
@@ -147,35 +1783,205 @@ class GitHubRepoUpdater:
             params['page'] += 1
             
             # Safety limit to prevent infinite loops
-            if params['page'] > 10:
+            if max_pages and params['page'] > max_pages:
                 break
-        
+    
+    def iter_repo_commits(self, repo_name: str, days: int = 30, since: Optional[str] = None,
+                          strict: bool = False) -> Iterator[Dict]:
+        """Stream recent commits page by page without accumulating them"""
+        # Start the window at midnight UTC so the URL (and its cache key) stays the same all day
+        since_date = since or (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%dT00:00:00Z')
+        url = f'{self.api_base}/repos/{self.username}/{repo_name}/commits'
+        return self._iter_pages(url, {'since': since_date}, max_pages=10, strict=strict)
+    
+    @_timed('commits')
+    def get_repo_commits(self, repo_name: str, days: int = 30, since: Optional[str] = None) -> List[Dict]:
+        """Get recent commits with pagination support"""
+        all_commits = list(self.iter_repo_commits(repo_name, days=days, since=since))
         logger.info(f"Fetched {len(all_commits)} commits for {repo_name}")
         return all_commits
     
+    @_timed('commits')
+    def get_commit_times(self, repo_name: str, days: int = 30) -> array:
+        """Get author times of recent commits as compact epoch seconds"""
+        times = array('d')
+        for commit in self.iter_repo_commits(repo_name, days=days):
+            authored_at = self._github_epoch(commit['commit']['author']['date'])
+            if authored_at:
+                times.append(authored_at)
+        logger.info(f"Fetched {len(times)} commits for {repo_name}")
+        return times
+    
+    @_timed('commits_sync')
+    def sync_repo_commits(self, repo_name: str, days: int = 90) -> int:
+        """Fetch only commits newer than the last sync into the commit store"""
+        window_start = time.time() - days * 86400
+        repo_key = self._repo_key(repo_name)
+        last = self.commit_store.last_sync(repo_key)
+        
+        if last and self._github_epoch(last[1]) > window_start:
+            # GitHub's 'since' is inclusive, so the newest known commit comes back and is ignored
+            commits = self.iter_repo_commits(repo_name, since=last[1], strict=True)
+        else:
+            commits = self.iter_repo_commits(repo_name, days=days, strict=True)
+        
+        # Keep only (sha, author time) per commit while streaming
+        entries = []
+        newest = last
+        newest_epoch = self._github_epoch(last[1]) if last else 0.0
+        try:
+            for commit in commits:
+                authored_at = self._github_epoch(commit['commit']['author']['date'])
+                if not authored_at:
+                    continue
+                entries.append((commit['sha'], authored_at))
+                committed_date = commit['commit']['committer']['date']
+                committed_at = self._github_epoch(committed_date)
+                if committed_at > newest_epoch:
+                    newest, newest_epoch = (commit['sha'], committed_date), committed_at
+        except PaginationError as e:
+            # Keep what arrived, but leave the cursor where it was so the missing pages are fetched next time
+            logger.warning(f"Incomplete commit sync for {repo_name}: {e}")
+            newest = last
+        
+        self.commit_store.record_sync(repo_key, entries, newest, window_start)
+        logger.info(f"Synced {len(entries)} new commits for {repo_name}")
+        return len(entries)
+    
+    def get_commit_activity(self, repo_name: str) -> Tuple[int, int]:
+        """Return (commits in last 7 days, commits in last 30 days) from the commit store"""
+        now = time.time()
+        repo_key = self._repo_key(repo_name)
+        return (
+            self.commit_store.count_since(repo_key, now - 7 * 86400),
+            self.commit_store.count_since(repo_key, now - 30 * 86400)
+        )
+    
+    @_timed('commit_stats')
+    def _request_commit_stats(self, repo_name: str) -> Tuple[Optional[int], Optional[List[Dict]]]:
+        """One request for weekly commit activity: (status, weeks), with weeks None unless ready"""
+        url = f'{self.api_base}/repos/{self.username}/{repo_name}/stats/commit_activity'
+        status, data = self._request_json(url)
+        if status == 200 and isinstance(data, list):
+            return status, data
+        if status == 204:
+            return status, []
+        return status, None
+    
+    def get_commit_activity_stats(self, repo_name: str) -> Optional[List[Dict]]:
+        """Get weekly commit activity for the last year, polling while GitHub computes it"""
+        delay = self.stats_poll_delay
+        
+        for attempt in range(self.stats_max_polls + 1):
+            status, weeks = self._request_commit_stats(repo_name)
+            if status != 202:
+                if weeks is None:
+                    break
+                return weeks
+            if attempt == self.stats_max_polls:
+                break
+            
+            logger.info(f"Commit statistics for {repo_name} are being computed, retrying in {delay:.0f}s")
+            time.sleep(delay)
+            delay *= 2
+        
+        logger.warning(f"Commit statistics unavailable for {repo_name}")
+        return None
+    
+    def _poll_pending_stats(self, snapshots: List[RepoSnapshot]):
+        """Re-poll statistics still being computed in shared rounds, then finish those snapshots"""
+        def poll(snapshot: RepoSnapshot) -> bool:
+            status, weeks = self._request_commit_stats(snapshot.name)
+            if status == 202:
+                return False
+            self._finish_activity(snapshot, weeks)
+            return True
+        
+        def give_up(snapshot: RepoSnapshot):
+            logger.warning(f"Commit statistics unavailable for {snapshot.name}")
+            self._finish_activity(snapshot, None)
+        
+        pending = list(snapshots)
+        delay = self.stats_poll_delay
+        for _ in range(self.stats_max_polls):
+            if not pending:
+                return
+            # One wait per round for every pending repository, instead of one per repository
+            logger.info(f"Commit statistics for {len(pending)} repositories are being computed, "
+                        f"re-polling in {delay:.0f}s")
+            time.sleep(delay)
+            delay *= 2
+            done = self._map(poll, pending)
+            pending = [snapshot for snapshot, finished in zip(pending, done) if not finished]
+        
+        self._map(give_up, pending)
+    
+    def _map(self, func, items: List) -> List:
+        """Apply func to items, on the worker pool when concurrency is enabled"""
+        if self.max_workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(func, items))
+        return [func(item) for item in items]
+    
+    def _stats_to_days(self, weeks: List[Dict], days: int = 30) -> List[List[float]]:
+        """Flatten weekly stats into [day start epoch, commits] pairs for the last N days"""
+        cutoff = time.time() - (days + 1) * 86400
+        commit_days = []
+        for week in weeks:
+            for offset, count in enumerate(week.get('days', [])):
+                day_start = week['week'] + offset * 86400
+                if count and day_start >= cutoff:
+                    commit_days.append([day_start, count])
+        return commit_days
+    
+    def _count_recent_days(self, commit_days: List[List[float]]) -> Tuple[int, int]:
+        """Count commits from daily buckets overlapping the last 7 and 30 days"""
+        now = time.time()
+        return (
+            int(sum(count for day, count in commit_days if day + 86400 > now - 7 * 86400)),
+            int(sum(count for day, count in commit_days if day + 86400 > now - 30 * 86400))
+        )
+    
+    def _count_recent(self, epochs) -> Tuple[int, int]:
+        """Count commit times falling in the last 7 and 30 days in a single pass"""
+        now = time.time()
+        cutoff_7d = now - 7 * 86400
+        cutoff_30d = now - 30 * 86400
+        recent_7d = recent_30d = 0
+        for t in epochs:
+            if t > cutoff_30d:
+                recent_30d += 1
+                if t > cutoff_7d:
+                    recent_7d += 1
+        return recent_7d, recent_30d
+    
+    @_timed('languages')
     def get_repo_languages(self, repo_name: str) -> Dict[str, int]:
         """Get programming languages used in repository"""
         url = f'{self.api_base}/repos/{self.username}/{repo_name}/languages'
         data = self._make_request(url)
         return data or {}
     
+    def iter_repo_pulls(self, repo_name: str, state: str = 'open') -> Iterator[Dict]:
+        """Stream every pull request in the given state"""
+        url = f'{self.api_base}/repos/{self.username}/{repo_name}/pulls'
+        return self._iter_pages(url, {'state': state})
+    
+    def iter_repo_issues(self, repo_name: str, state: str = 'open') -> Iterator[Dict]:
+        """Stream every issue in the given state (excluding pull requests)"""
+        url = f'{self.api_base}/repos/{self.username}/{repo_name}/issues'
+        # Filter out pull requests (issues API includes PRs)
+        return (issue for issue in self._iter_pages(url, {'state': state}) if 'pull_request' not in issue)
+    
+    @_timed('pulls')
     def get_repo_pulls(self, repo_name: str, state: str = 'open') -> List[Dict]:
         """Get pull requests for repository"""
-        url = f'{self.api_base}/repos/{self.username}/{repo_name}/pulls'
-        params = {'state': state, 'per_page': 100}
-        data = self._make_request(url, params)
-        return data or []
+        return list(self.iter_repo_pulls(repo_name, state))
     
+    @_timed('issues')
     def get_repo_issues(self, repo_name: str, state: str = 'open') -> List[Dict]:
         """Get issues for repository (excluding pull requests)"""
-        url = f'{self.api_base}/repos/{self.username}/{repo_name}/issues'
-        params = {'state': state, 'per_page': 100}
-        data = self._make_request(url, params)
-        
-        # Filter out pull requests (issues API includes PRs)
-        if data:
-            return [issue for issue in data if 'pull_request' not in issue]
-        return []
+        return list(self.iter_repo_issues(repo_name, state))
     
     def get_primary_language(self, languages: Dict[str, int]) -> str:
         """Determine primary language from language statistics"""
@@ -191,16 +1997,17 @@ class GitHubRepoUpdater:
         if not commits:
             return RepoStatus.INACTIVE
         
-        # Analyze commit frequency
-        now = datetime.now()
-        recent_commits_30d = len([
-            c for c in commits 
-            if self._parse_github_date(c['commit']['author']['date']) > now - timedelta(days=30)
-        ])
-        recent_commits_7d = len([
-            c for c in commits 
-            if self._parse_github_date(c['commit']['author']['date']) > now - timedelta(days=7)
-        ])
+        # Analyze commit frequency, parsing each date once
+        recent_commits_7d, recent_commits_30d = self._count_recent(
+            array('d', (self._github_epoch(c['commit']['author']['date']) for c in commits))
+        )
+        
+        return self.status_from_activity(repo_info, recent_commits_7d, recent_commits_30d)
+    
+    def status_from_activity(self, repo_info: Dict, recent_commits_7d: int, recent_commits_30d: int) -> RepoStatus:
+        """Calculate repository status from commit counts in the 7 and 30 day windows"""
+        if repo_info.get('archived', False):
+            return RepoStatus.ARCHIVED
         
         # Determine status based on activity
         if recent_commits_7d >= 5 or recent_commits_30d >= 20:
@@ -219,6 +2026,13 @@ class GitHubRepoUpdater:
         except:
             return datetime.min
     
+    def _github_epoch(self, date_string: str) -> float:
+        """Parse GitHub date string to UTC epoch seconds (0 if unparseable)"""
+        date_obj = self._parse_github_date(date_string)
+        if date_obj == datetime.min:
+            return 0.0
+        return date_obj.replace(tzinfo=timezone.utc).timestamp()
+    
     def format_number(self, num: int) -> str:
         """Format numbers for display"""
         if num >= 1000000:
@@ -255,149 +2069,438 @@ class GitHubRepoUpdater:
         except:
             return "Unknown"
     
+    # Language -> (alt text, shields.io label, color, logo, logo color)
+    LANGUAGE_BADGES = {
+        'Python': ('Python', 'Python', '3776AB', 'python', 'white'),
+        'JavaScript': ('JavaScript', 'JavaScript', 'F7DF1E', 'javascript', 'black'),
+        'TypeScript': ('TypeScript', 'TypeScript', '007ACC', 'typescript', 'white'),
+        'React': ('React', 'React', '20232A', 'react', '61DAFB'),
+        'Next.js': ('Next.js', 'Next.js', '000000', 'next.js', 'white'),
+        'Vue.js': ('Vue.js', 'Vue.js', '35495E', 'vue.js', '4FC08D'),
+        'Angular': ('Angular', 'Angular', 'DD0031', 'angular', 'white'),
+        'Node.js': ('Node.js', 'Node.js', '43853D', 'node.js', 'white'),
+        'Java': ('Java', 'Java', 'ED8B00', 'java', 'white'),
+        'C++': ('C++', 'C++', '00599C', 'c%2B%2B', 'white'),
+        'C#': ('C#', 'C%23', '239120', 'c-sharp', 'white'),
+        'Go': ('Go', 'Go', '00ADD8', 'go', 'white'),
+        'Rust': ('Rust', 'Rust', '000000', 'rust', 'white'),
+        'PHP': ('PHP', 'PHP', '777BB4', 'php', 'white'),
+        'Ruby': ('Ruby', 'Ruby', 'CC342D', 'ruby', 'white'),
+        'Swift': ('Swift', 'Swift', 'FA7343', 'swift', 'white'),
+        'Kotlin': ('Kotlin', 'Kotlin', '0095D5', 'kotlin', 'white'),
+        'Dart': ('Dart', 'Dart', '0175C2', 'dart', 'white'),
+        'HTML': ('HTML', 'HTML', 'E34F26', 'html5', 'white'),
+        'CSS': ('CSS', 'CSS', '1572B6', 'css3', 'white'),
+        'Shell': ('Shell', 'Shell', '4EAA25', 'gnu-bash', 'white'),
+        'Dockerfile': ('Docker', 'Docker', '2496ED', 'docker', 'white'),
+    }
+    
+    STATUS_COLORS = {
+        RepoStatus.VERY_ACTIVE: 'brightgreen',
+        RepoStatus.ACTIVE: 'green',
+        RepoStatus.MAINTAINED: 'yellow',
+        RepoStatus.INACTIVE: 'red',
+        RepoStatus.ARCHIVED: 'lightgray'
+    }
+    
     def get_language_badge(self, language: str) -> str:
         """Get language badge markdown with comprehensive language support"""
-        language_badges = {
-            'Python': '![Python](https://img.shields.io/badge/Python-3776AB?style=flat&logo=python&logoColor=white)',
-            'JavaScript': '![JavaScript](https://img.shields.io/badge/JavaScript-F7DF1E?style=flat&logo=javascript&logoColor=black)',
-            'TypeScript': '![TypeScript](https://img.shields.io/badge/TypeScript-007ACC?style=flat&logo=typescript&logoColor=white)',
-            'React': '![React](https://img.shields.io/badge/React-20232A?style=flat&logo=react&logoColor=61DAFB)',
-            'Next.js': '![Next.js](https://img.shields.io/badge/Next.js-000000?style=flat&logo=next.js&logoColor=white)',
-            'Vue.js': '![Vue.js](https://img.shields.io/badge/Vue.js-35495E?style=flat&logo=vue.js&logoColor=4FC08D)',
-            'Angular': '![Angular](https://img.shields.io/badge/Angular-DD0031?style=flat&logo=angular&logoColor=white)',
-            'Node.js': '![Node.js](https://img.shields.io/badge/Node.js-43853D?style=flat&logo=node.js&logoColor=white)',
-            'Java': '![Java](https://img.shields.io/badge/Java-ED8B00?style=flat&logo=java&logoColor=white)',
-            'C++': '![C++](https://img.shields.io/badge/C++-00599C?style=flat&logo=c%2B%2B&logoColor=white)',
-            'C#': '![C#](https://img.shields.io/badge/C%23-239120?style=flat&logo=c-sharp&logoColor=white)',
-            'Go': '![Go](https://img.shields.io/badge/Go-00ADD8?style=flat&logo=go&logoColor=white)',
-            'Rust': '![Rust](https://img.shields.io/badge/Rust-000000?style=flat&logo=rust&logoColor=white)',
-            'PHP': '![PHP](https://img.shields.io/badge/PHP-777BB4?style=flat&logo=php&logoColor=white)',
-            'Ruby': '![Ruby](https://img.shields.io/badge/Ruby-CC342D?style=flat&logo=ruby&logoColor=white)',
-            'Swift': '![Swift](https://img.shields.io/badge/Swift-FA7343?style=flat&logo=swift&logoColor=white)',
-            'Kotlin': '![Kotlin](https://img.shields.io/badge/Kotlin-0095D5?style=flat&logo=kotlin&logoColor=white)',
-            'Dart': '![Dart](https://img.shields.io/badge/Dart-0175C2?style=flat&logo=dart&logoColor=white)',
-            'HTML': '![HTML](https://img.shields.io/badge/HTML-E34F26?style=flat&logo=html5&logoColor=white)',
-            'CSS': '![CSS](https://img.shields.io/badge/CSS-1572B6?style=flat&logo=css3&logoColor=white)',
-            'Shell': '![Shell](https://img.shields.io/badge/Shell-4EAA25?style=flat&logo=gnu-bash&logoColor=white)',
-            'Dockerfile': '![Docker](https://img.shields.io/badge/Docker-2496ED?style=flat&logo=docker&logoColor=white)',
-        }
-        return language_badges.get(language, f'![{language}](https://img.shields.io/badge/{language.replace(" ", "%20")}-gray?style=flat)')
+        known = self.LANGUAGE_BADGES.get(language)
+        if self.badges:
+            alt, _, color, _, _ = known or (language, None, 'gray', None, None)
+            return self.badges.badge(alt, '', alt, color)
+        if known:
+            alt, label, color, logo, logo_color = known
+            return f'![{alt}](https://img.shields.io/badge/{label}-{color}?style=flat&logo={logo}&logoColor={logo_color})'
+        return f'![{language}](https://img.shields.io/badge/{language.replace(" ", "%20")}-gray?style=flat)'
     
     def get_status_badge(self, status: RepoStatus) -> str:
         """Get status badge markdown"""
-        status_colors = {
-            RepoStatus.VERY_ACTIVE: 'brightgreen',
-            RepoStatus.ACTIVE: 'green',
-            RepoStatus.MAINTAINED: 'yellow',
-            RepoStatus.INACTIVE: 'red',
-            RepoStatus.ARCHIVED: 'lightgray'
-        }
-        color = status_colors.get(status, 'gray')
+        color = self.STATUS_COLORS.get(status, 'gray')
+        if self.badges:
+            return self.badges.badge(status.value, 'Status', status.value, color)
         status_text = status.value.replace(' ', '%20')
         return f'![{status.value}](https://img.shields.io/badge/Status-{status_text}-{color})'
     
-    def process_repository(self, repo_config: RepoConfig) -> Optional[str]:
-        """Process a single repository and return table row"""
+    def fetch_snapshot(self, repo_config: RepoConfig, prefetched: Optional[Dict] = None) -> RepoSnapshot:
+        """Fetch everything the renderers need for a single repository"""
         repo_name = repo_config.name
-        display_name = repo_config.display_name or repo_name
+        snapshot = RepoSnapshot(config=repo_config)
         
         logger.info(f"Processing repository: {repo_name}")
         
-        # Get repository information
-        repo_info = self.get_repo_info(repo_name)
-        if not repo_info:
-            logger.error(f"Skipping {repo_name} - could not fetch info")
-            return None
-        
-        # Get repository statistics
-        commits = self.get_repo_commits(repo_name, days=90)
-        languages = self.get_repo_languages(repo_name)
+        if prefetched:
+            # Batched GraphQL data already carries info, languages and activity counts
+            snapshot.repo_info = prefetched['repo_info']
+            snapshot.languages = prefetched['languages']
+            snapshot.commits_7d = prefetched['commits_7d']
+            snapshot.commits_30d = prefetched['commits_30d']
+            snapshot.open_issues = prefetched['open_issues']
+            snapshot.closed_issues = prefetched['closed_issues']
+            snapshot.open_prs = prefetched['open_prs']
+            snapshot.closed_prs = prefetched['closed_prs']
+            snapshot.last_commit_date = prefetched['last_commit_date']
+        else:
+            # Get repository information
+            snapshot.repo_info = self.get_repo_info(repo_name)
+            if not snapshot.repo_info:
+                logger.error(f"Skipping {repo_name} - could not fetch info")
+                return snapshot
+            
+            # Skip the commits and languages calls when nothing was pushed since the last run
+            state = None
+            if self.repo_state:
+                state = self.repo_state.unchanged(self._repo_key(repo_name), snapshot.repo_info)
+            if (state and not self.commit_store
+                    and state.get('commit_days') is None and state.get('commit_epochs') is None):
+                # Recorded while the commit store was on; with it off there is nothing to recount from
+                logger.info(f"{repo_name} has no stored activity for this configuration, refetching")
+                state = None
+            if state:
+                logger.info(f"{repo_name} unchanged since last run, reusing stored metrics")
+                snapshot.languages = state.get('languages', {})
+                if state.get('commit_days') is not None:
+                    snapshot.commits_7d, snapshot.commits_30d = self._count_recent_days(state['commit_days'])
+                elif self.commit_store:
+                    snapshot.commits_7d, snapshot.commits_30d = self.get_commit_activity(repo_name)
+                else:
+                    # Recount stored commit times so activity still decays with age
+                    snapshot.commits_7d, snapshot.commits_30d = self._count_recent(state['commit_epochs'])
+            else:
+                snapshot.languages = self.get_repo_languages(repo_name)
+                
+                # Weekly statistics cover busy repositories in one request; paging is the fallback
+                weeks = None
+                if self.activity_source == 'stats':
+                    if self._pending_stats is None:
+                        weeks = self.get_commit_activity_stats(repo_name)
+                    else:
+                        stats_status, weeks = self._request_commit_stats(repo_name)
+                        if stats_status == 202:
+                            # Still being computed: finished by _poll_pending_stats after the batch
+                            with self._stats_lock:
+                                self._pending_stats.append(snapshot)
+                            snapshot.last_commit_date = snapshot.repo_info.get('pushed_at')
+                            snapshot.primary_language = self.get_primary_language(snapshot.languages)
+                            logger.info(f"Commit statistics for {repo_name} pending")
+                            return snapshot
+                self._apply_activity(snapshot, weeks)
+            
+            snapshot.last_commit_date = snapshot.repo_info.get('pushed_at')
         
         # Calculate metrics
-        primary_language = self.get_primary_language(languages)
-        status = self.calculate_repo_status(repo_info, commits)
+        snapshot.primary_language = self.get_primary_language(snapshot.languages)
+        self._set_status(snapshot)
+        
+        logger.info(f"Successfully processed {repo_name}")
+        if self.planner:
+            self.planner.checkpoint(self, snapshot)
+        return snapshot
+    
+    def _apply_activity(self, snapshot: RepoSnapshot, weeks: Optional[List[Dict]]):
+        """Fill commit counts from weekly statistics (or by paging commits) and store them for later runs"""
+        repo_name = snapshot.name
+        commit_epochs = None
+        commit_days = None
+        
+        if weeks is not None:
+            commit_days = self._stats_to_days(weeks)
+            snapshot.commits_7d, snapshot.commits_30d = self._count_recent_days(commit_days)
+        elif self.commit_store:
+            self.sync_repo_commits(repo_name, days=90)
+            snapshot.commits_7d, snapshot.commits_30d = self.get_commit_activity(repo_name)
+        else:
+            commit_times = self.get_commit_times(repo_name, days=90)
+            snapshot.commits_7d, snapshot.commits_30d = self._count_recent(commit_times)
+            commit_epochs = commit_times.tolist()
+        
+        # An empty language map usually means the request failed; don't pin it
+        if self.repo_state and (snapshot.languages or snapshot.repo_info.get('size') == 0):
+            self.repo_state.update(
+                self._repo_key(repo_name),
+                pushed_at=snapshot.repo_info.get('pushed_at'),
+                updated_at=snapshot.repo_info.get('updated_at'),
+                languages=snapshot.languages,
+                commit_epochs=commit_epochs,
+                commit_days=commit_days,
+                row=None
+            )
+    
+    def _finish_activity(self, snapshot: RepoSnapshot, weeks: Optional[List[Dict]]):
+        """Complete a snapshot whose statistics were pending"""
+        self._apply_activity(snapshot, weeks)
+        self._set_status(snapshot)
+        logger.info(f"Successfully processed {snapshot.name}")
+        if self.planner:
+            self.planner.checkpoint(self, snapshot)
+    
+    def _set_status(self, snapshot: RepoSnapshot):
+        """Status from activity, unless the config overrides it"""
+        status = self.status_from_activity(snapshot.repo_info, snapshot.commits_7d, snapshot.commits_30d)
         
         # Use custom status if provided
-        if repo_config.custom_status:
+        if snapshot.config.custom_status:
             try:
-                status = RepoStatus(repo_config.custom_status)
+                status = RepoStatus(snapshot.config.custom_status)
             except ValueError:
-                logger.warning(f"Invalid custom status '{repo_config.custom_status}' for {repo_name}")
+                logger.warning(f"Invalid custom status '{snapshot.config.custom_status}' for {snapshot.name}")
+        snapshot.status = status
+    
+    def collect_snapshots(self, repo_configs: List[RepoConfig]) -> List[RepoSnapshot]:
+        """Fetch phase: build one snapshot per repository, in repo_configs order"""
+        if not self.planner:
+            return self._fetch_snapshots(repo_configs)
+        
+        # Fetch what the budget allows; everything else keeps its last checkpointed snapshot
+        resource = 'graphql' if self.backend == 'graphql' else 'core'
+        to_fetch, deferred = self.planner.plan(self, repo_configs, self.refresh_budget(resource))
+        fetched = {snapshot.name: snapshot for snapshot in self._fetch_snapshots(to_fetch)}
+        # Issue/PR counts arrive after the per-repository checkpoints; write the complete set now
+        self.planner.record(self, list(fetched.values()))
+        self.planner.save()
+        
+        snapshots = []
+        for repo_config in repo_configs:
+            snapshot = fetched.get(repo_config.name)
+            if not snapshot or not snapshot.ok:
+                restored = self.planner.restore(self, repo_config)
+                if restored:
+                    reason = "deferred" if snapshot is None else "fetch failed"
+                    logger.info(f"Using checkpointed data for {repo_config.name} ({reason})")
+                    snapshot = restored
+            snapshots.append(snapshot or RepoSnapshot(config=repo_config))
+        return snapshots
+    
+    def _fetch_snapshots(self, repo_configs: List[RepoConfig]) -> List[RepoSnapshot]:
+        """Fetch snapshots for the given repositories using the configured backend"""
+        if not repo_configs:
+            return []
+        if self.backend == 'graphql':
+            prefetched = self.fetch_repos_graphql(
+                [config.name for config in repo_configs], batch_size=self.graphql_batch_size
+            )
+            # Repos missing from the batch response fall back to the REST path
+            snapshots = [
+                self.fetch_snapshot(repo_config, prefetched.get(repo_config.name))
+                for repo_config in repo_configs
+            ]
+        else:
+            if self.max_workers > 1 and len(repo_configs) > 1:
+                logger.info(f"Processing {len(repo_configs)} repositories with {self.max_workers} workers")
+            
+            # Statistics that answer 202 are collected here and re-polled together once every request is out
+            self._pending_stats = [] if self.activity_source == 'stats' else None
+            try:
+                # _map keeps results in repo_configs order
+                snapshots = self._map(self.fetch_snapshot, repo_configs)
+                if self._pending_stats:
+                    self._poll_pending_stats(self._pending_stats)
+            finally:
+                self._pending_stats = None
+        
+        self._apply_issue_pr_counts(snapshots)
+        return snapshots
+    
+    def _apply_issue_pr_counts(self, snapshots: List[RepoSnapshot]):
+        """Fill issue/PR totals for tracked repositories with batched count queries"""
+        tracked = [
+            snapshot for snapshot in snapshots
+            if snapshot.ok and (snapshot.config.track_issues or snapshot.config.track_prs)
+            and snapshot.open_issues is None and snapshot.open_prs is None
+        ]
+        if not tracked:
+            return
+        
+        counts = self.get_issue_pr_counts([snapshot.name for snapshot in tracked])
+        for snapshot in tracked:
+            repo_counts = counts.get(snapshot.name)
+            if not repo_counts:
+                continue
+            if snapshot.config.track_issues:
+                snapshot.open_issues = repo_counts['open_issues']
+                snapshot.closed_issues = repo_counts['closed_issues']
+            if snapshot.config.track_prs:
+                snapshot.open_prs = repo_counts['open_prs']
+                snapshot.closed_prs = repo_counts['closed_prs']
+    
+    def render_row(self, snapshot: RepoSnapshot) -> Optional[str]:
+        """Render the README table row for a fetched repository"""
+        if not snapshot.ok:
+            return None
+        
+        repo_config = snapshot.config
+        repo_name = repo_config.name
+        display_name = repo_config.display_name or repo_name
+        
+        # Reuse the previous run's row when none of its inputs changed
+        row_inputs = [display_name, snapshot.status.value, snapshot.primary_language, repo_config.track_issues]
+        if self.badges:
+            # Local badges bake the values into the row, so they are inputs too
+            repo_info = snapshot.repo_info
+            open_issues = snapshot.open_issues
+            open_issues_and_prs = repo_info.get('open_issues_count', 0)
+            last_commit = self.format_date(snapshot.last_commit_date or repo_info.get('pushed_at'))
+            row_inputs += [
+                repo_info.get('stargazers_count', 0), repo_info.get('forks_count', 0),
+                open_issues, open_issues_and_prs, last_commit
+            ]
+        trend_cells = self.trend_cells(snapshot) if self.trend_days else []
+        row_inputs += trend_cells
+        state = self.repo_state.get(self._repo_key(repo_name)) if self.repo_state else None
+        if state and state.get('row') and state.get('row_inputs') == row_inputs:
+            if not self.badges or self.badges.available(state['row']):
+                return state['row']
         
         # Format badges
-        status_badge = self.get_status_badge(status)
-        language_badge = self.get_language_badge(primary_language)
-        stars_badge = f'![Stars](https://img.shields.io/github/stars/{self.username}/{repo_name}?style=flat)'
-        forks_badge = f'![Forks](https://img.shields.io/github/forks/{self.username}/{repo_name}?style=flat)'
+        status_badge = self.get_status_badge(snapshot.status)
+        language_badge = self.get_language_badge(snapshot.primary_language)
+        if self.badges:
+            stars_badge = self.badges.badge('Stars', 'Stars', self.format_number(row_inputs[4]), 'blue')
+            forks_badge = self.badges.badge('Forks', 'Forks', self.format_number(row_inputs[5]), 'blue')
+        else:
+            stars_badge = f'![Stars](https://img.shields.io/github/stars/{self.username}/{repo_name}?style=flat)'
+            forks_badge = f'![Forks](https://img.shields.io/github/forks/{self.username}/{repo_name}?style=flat)'
         
         # Conditional badges
         badges = [status_badge, language_badge, stars_badge, forks_badge]
         
         if repo_config.track_issues:
-            issues_badge = f'![Issues](https://img.shields.io/github/issues/{self.username}/{repo_name}?style=flat)'
+            if self.badges and open_issues is not None:
+                issues_badge = self.badges.badge(
+                    'Issues', 'Issues', self.format_number(open_issues), 'yellow' if open_issues else 'brightgreen'
+                )
+            elif self.badges:
+                # Without the exact count, label the combined figure for what it is
+                issues_badge = self.badges.badge(
+                    'Issues', 'Issues + PRs', self.format_number(open_issues_and_prs),
+                    'yellow' if open_issues_and_prs else 'brightgreen'
+                )
+            else:
+                issues_badge = f'![Issues](https://img.shields.io/github/issues/{self.username}/{repo_name}?style=flat)'
             badges.append(issues_badge)
         
-        last_commit_badge = f'![Last Commit](https://img.shields.io/github/last-commit/{self.username}/{repo_name}?style=flat)'
+        if self.badges:
+            last_commit_badge = self.badges.badge('Last Commit', 'Last Commit', last_commit, 'green')
+        else:
+            last_commit_badge = f'![Last Commit](https://img.shields.io/github/last-commit/{self.username}/{repo_name}?style=flat)'
         badges.append(last_commit_badge)
         
         # Create table row
-        row = f"| {display_name} | " + " | ".join(badges) + " |"
+        row = f"| {display_name} | " + " | ".join(badges + trend_cells) + " |"
         
-        logger.info(f"Successfully processed {repo_name}")
+        if self.repo_state:
+            self.repo_state.update(self._repo_key(repo_name), row=row, row_inputs=row_inputs)
         return row
     
-    def update_repository_table(self, readme_content: str, repo_configs: List[RepoConfig]) -> str:
-        """Update the repository status table in README content"""
+    def trend_cells(self, snapshot: RepoSnapshot, samples: int = 12) -> List[str]:
+        """Star change over trend_days and a commit activity sparkline, from history only"""
+        key = self._repo_key(snapshot.name)
+        stars_delta = self.history.delta(key, 'stars', snapshot.repo_info.get('stargazers_count', 0), self.trend_days)
+        recent = [value for _, value in self.history.series(key, 'commits_7d')][-(samples - 1):]
+        return [
+            '—' if stars_delta is None else f'{stars_delta:+d}',
+            self.history.sparkline(recent + [snapshot.commits_7d])
+        ]
+    
+    def process_repository(self, repo_config: RepoConfig, prefetched: Optional[Dict] = None) -> Optional[str]:
+        """Process a single repository and return table row"""
+        return self.render_row(self.fetch_snapshot(repo_config, prefetched))
+    
+    def render_table(self, snapshots: List[RepoSnapshot]) -> Optional[str]:
+        """Render the repository status table, or None if no repository was fetched"""
         
         # Build new table rows
         new_rows = []
-        successful_repos = 0
-        
-        for repo_config in repo_configs:
-            row = self.process_repository(repo_config)
+        for snapshot in snapshots:
+            row = self.render_row(snapshot)
             if row:
                 new_rows.append(row)
-                successful_repos += 1
         
         if not new_rows:
-            logger.error("No repositories were successfully processed")
-            return readme_content
+            return None
         
         # Dynamic table header based on configuration
         headers = ["Repository", "Status", "Language", "Stars", "Forks"]
-        if any(config.track_issues for config in repo_configs):
+        if any(snapshot.config.track_issues for snapshot in snapshots):
             headers.append("Issues")
         headers.append("Last Commit")
+        if self.trend_days:
+            headers += [f"Stars ({self.trend_days}d)", "Activity"]
         
-        # Find and replace the table in README
-        table_pattern = r'(\| Repository \| Status \| Language \| Stars \| Forks \|[^\n]*\n\|[^\n]*\n)((?:\|.*?\n)*)'
-        
-        if re.search(table_pattern, readme_content, re.MULTILINE):
-            # Build new table
-            header_row = "| " + " | ".join(headers) + " |"
-            separator_row = "|" + "|".join([" --- " for _ in headers]) + "|"
-            new_table = header_row + "\n" + separator_row + "\n" + "\n".join(new_rows)
-            
-            # Replace existing table
-            readme_content = re.sub(
-                table_pattern,
-                new_table + '\n\n',
-                readme_content,
-                flags=re.MULTILINE
-            )
-            
-            logger.info(f"Successfully updated table with {successful_repos} repositories")
-        else:
-            logger.warning("Could not find repository table to update")
+        header_row = "| " + " | ".join(headers) + " |"
+        separator_row = "|" + "|".join([" --- " for _ in headers]) + "|"
+        return header_row + "\n" + separator_row + "\n" + "\n".join(new_rows)
+    
+    def update_repository_table(self, readme_content: str, repo_configs: List[RepoConfig],
+                                snapshots: Optional[List[RepoSnapshot]] = None) -> str:
+        """Update the repository status table in README content"""
+        if snapshots is None:
+            snapshots = self.collect_snapshots(repo_configs)
         
-        return readme_content
+        document = ReadmeDocument(readme_content)
+        if not document.has('repos'):
+            # Older READMEs have a bare table; give it markers so later runs can find it directly
+            marked = add_table_markers(readme_content)
+            if marked is None:
+                logger.warning("Could not find repository table to update")
+                return readme_content
+            document = ReadmeDocument(marked)
+        
+        self.update_table_section(document, 'repos', snapshots)
+        return document.render()
+    
+    def update_table_section(self, document: ReadmeDocument, section: str, snapshots: List[RepoSnapshot]) -> bool:
+        """Render the table into a README section; returns whether the section changed"""
+        if not document.has(section):
+            logger.warning(f"Could not find README section '{section}' to update")
+            return False
+        
+        new_table = self.render_table(snapshots)
+        if not new_table:
+            logger.error(f"No repositories were successfully processed for {self.username}")
+            return False
+        
+        successful_repos = sum(1 for snapshot in snapshots if snapshot.ok)
+        if document.set(section, new_table):
+            logger.info(f"Updated section '{section}' with {successful_repos} repositories")
+            return True
+        logger.info(f"Section '{section}' unchanged ({successful_repos} repositories)")
+        return False
+    
+    def update_row(self, readme_content: str, snapshot: RepoSnapshot) -> str:
+        """Replace a single repository's row inside this account's table section"""
+        row = self.render_row(snapshot)
+        if not row:
+            return readme_content
+        
+        document = ReadmeDocument(readme_content)
+        section = next((name for name in (f'repos-{self.username}', 'repos') if document.has(name)), None)
+        if not section:
+            logger.warning(f"No table section for {self.username}; rows appear after the next full update")
+            return readme_content
+        
+        table = document.get(section)
+        display_name = snapshot.config.display_name or snapshot.name
+        match = re.search(rf'^\| {re.escape(display_name)} \|.*$', table, re.MULTILINE)
+        if not match:
+            logger.warning(f"No table row for {display_name}; it appears after the next full update")
+            return readme_content
+        
+        document.set(section, table[:match.start()] + row + table[match.end():])
+        return document.render()
+    
+    @_timed('user_info')
+    def get_user_info(self) -> Optional[Dict]:
+        """Fetch the user profile once per run"""
+        if self._user_info is None:
+            self._user_info = self._make_request(f'{self.api_base}/users/{self.username}')
+        return self._user_info
     
     def update_activity_stats(self, readme_content: str) -> str:
         """Update activity statistics in README"""
         
         try:
-            user_url = f'{self.api_base}/users/{self.username}'
-            user_data = self._make_request(user_url)
+            user_data = self.get_user_info()
             
             if user_data:
                 public_repos = user_data.get('public_repos', 0)
@@ -413,7 +2516,7 @@ class GitHubRepoUpdater:
                 if re.search(timestamp_pattern, readme_content):
                     readme_content = re.sub(
                         timestamp_pattern,
-                        f'\\1{timestamp}\\3',
+                        lambda match: f'{match.group(1)}{timestamp}{match.group(3)}',
                         readme_content
                     )
                 else:
@@ -425,25 +2528,300 @@ class GitHubRepoUpdater:
         
         return readme_content
     
-    def generate_summary_report(self, repo_configs: List[RepoConfig]) -> str:
+    def generate_summary_report(self, snapshots: List[RepoSnapshot]) -> str:
         """Generate a summary report of the update process"""
         report = f"""
 === Repository Update Summary ===
 Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 User: {self.username}
-Repositories Processed: {len(repo_configs)}
+Repositories Processed: {len(snapshots)}
+API Requests Made: {self.request_count}
 Rate Limit Remaining: {self.rate_limit_remaining}
 """
         
-        for config in repo_configs:
-            repo_info = self.get_repo_info(config.name)
-            if repo_info:
-                report += f"\n✅ {config.name} - Last updated: {repo_info.get('updated_at', 'Unknown')}"
+        for snapshot in snapshots:
+            if snapshot.ok:
+                report += f"\n✅ {snapshot.name} - Last updated: {snapshot.repo_info.get('updated_at', 'Unknown')}"
             else:
-                report += f"\n❌ {config.name} - Failed to fetch"
+                report += f"\n❌ {snapshot.name} - Failed to fetch"
         
         return report
 
+class WebhookWatcher:
+    """Local webhook receiver that refreshes only the repositories named in incoming events"""
+    
+    EVENTS = {'push', 'star', 'watch', 'fork', 'issues', 'pull_request', 'release', 'repository'}
+    
+    def __init__(self, updaters: List[GitHubRepoUpdater], account_configs: List[List[RepoConfig]],
+                 readme_path: str, secret: Optional[str] = None, debounce: float = 30.0,
+                 max_delay: Optional[float] = None, on_update=None):
+        self.readme_path = readme_path
+        self.secret = secret
+        self.debounce = debounce
+        self.max_delay = max_delay if max_delay is not None else debounce * 4
+        self.on_update = on_update
+        
+        # "owner/repo" (lowercase) -> (updater, config)
+        self._targets: Dict[str, Tuple[GitHubRepoUpdater, RepoConfig]] = {}
+        for updater, configs in zip(updaters, account_configs):
+            for repo_config in configs:
+                self._targets[updater._repo_key(repo_config.name).lower()] = (updater, repo_config)
+        
+        # Repository key -> (first event, latest event) of the burst waiting to be refreshed
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+    
+    def verify_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check the X-Hub-Signature-256 header against the shared secret"""
+        if not self.secret:
+            return True
+        if not signature:
+            return False
+        expected = 'sha256=' + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+    
+    def handle_event(self, event: str, payload: Dict) -> bool:
+        """Queue a refresh for the repository an event is about; False if the event is ignored"""
+        if event not in self.EVENTS:
+            return False
+        key = ((payload.get('repository') or {}).get('full_name') or '').lower()
+        if key not in self._targets:
+            return False
+        
+        now = time.monotonic()
+        with self._condition:
+            first_seen = self._pending.get(key, (now, now))[0]
+            self._pending[key] = (first_seen, now)
+            self._condition.notify()
+        logger.info(f"Queued refresh of {key} after '{event}' event")
+        return True
+    
+    def _take_due(self) -> Tuple[List[str], Optional[float]]:
+        """Repositories whose burst has settled (or waited max_delay), and seconds until the next one is due"""
+        now = time.monotonic()
+        due, wait = [], None
+        for key, (first_seen, last_seen) in self._pending.items():
+            remaining = min(last_seen + self.debounce, first_seen + self.max_delay) - now
+            if remaining <= 0:
+                due.append(key)
+            elif wait is None or remaining < wait:
+                wait = remaining
+        for key in due:
+            del self._pending[key]
+        return due, wait
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                due, wait = self._take_due()
+                while not due and not self._stopped:
+                    self._condition.wait(wait)
+                    due, wait = self._take_due()
+                if self._stopped:
+                    return
+            try:
+                self.refresh(due)
+            except Exception as e:
+                logger.error(f"Error refreshing {', '.join(due)}: {e}")
+    
+    def refresh(self, keys: List[str]):
+        """Re-fetch the given repositories and rewrite only their README rows"""
+        snapshots = []
+        for key in keys:
+            updater, repo_config = self._targets[key]
+            # The discovery listing is from startup; the event means it is stale for this repository
+            updater.prefetched_info.pop(repo_config.name, None)
+            snapshot = updater.fetch_snapshot(repo_config)
+            updater._apply_issue_pr_counts([snapshot])
+            if not snapshot.ok:
+                logger.warning(f"Could not refresh {key}; keeping its current row")
+                continue
+            if updater.planner:
+                updater.planner.record(updater, [snapshot])
+            snapshots.append((updater, snapshot))
+        if not snapshots:
+            return
+        
+        with open(self.readme_path, 'r', encoding='utf-8') as file:
+            readme_content = file.read()
+        updated_content = readme_content
+        for updater, snapshot in snapshots:
+            updated_content = updater.update_row(updated_content, snapshot)
+        
+        if updated_content != readme_content:
+            with open(self.readme_path, 'w', encoding='utf-8') as file:
+                file.write(updated_content)
+            logger.info(f"Updated README rows for {', '.join(s.name for _, s in snapshots)}")
+        else:
+            logger.info(f"README rows for {', '.join(s.name for _, s in snapshots)} are unchanged")
+        
+        if self.on_update:
+            self.on_update()
+    
+    def _handler_class(self):
+        watcher = self
+        
+        class WebhookHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if not watcher.verify_signature(body, self.headers.get('X-Hub-Signature-256')):
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                
+                event = self.headers.get('X-GitHub-Event', '')
+                try:
+                    # Webhooks configured with the form content type send the JSON as a 'payload' field
+                    if self.headers.get_content_type() == 'application/x-www-form-urlencoded':
+                        payload = json.loads(parse_qs(body.decode('utf-8'))['payload'][0])
+                    else:
+                        payload = json.loads(body or b'{}')
+                except (KeyError, ValueError):
+                    payload = None
+                if not isinstance(payload, dict):
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                
+                queued = event != 'ping' and watcher.handle_event(event, payload)
+                self.send_response(202 if queued else 204)
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                logger.debug(f"Webhook {self.address_string()}: {format % args}")
+        
+        return WebhookHandler
+    
+    def serve(self, host: str = '127.0.0.1', port: int = 8080):
+        """Receive webhooks until interrupted"""
+        worker = threading.Thread(target=self._run, daemon=True)
+        worker.start()
+        server = ThreadingHTTPServer((host, port), self._handler_class())
+        logger.info(f"Watching for webhooks on http://{host}:{server.server_address[1]}/ "
+                    f"({len(self._targets)} repositories, {self.debounce:g}s debounce)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopping webhook watcher")
+        finally:
+            server.server_close()
+            with self._condition:
+                self._stopped = True
+                self._condition.notify()
+            worker.join()
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def load_cache() -> Optional[ResponseCache]:
+    """Create the response cache from environment settings, or None if bypassed"""
+    cache_dir = os.environ.get('GITHUB_CACHE_DIR', '.github_cache')
+    bypass = _env_flag('GITHUB_CACHE_BYPASS')
+    clear = _env_flag('GITHUB_CACHE_CLEAR')
+    
+    if bypass and not clear:
+        logger.info("Response cache bypassed")
+        return None
+    
+    try:
+        cache = ResponseCache(
+            cache_dir,
+            max_age_hours=float(os.environ.get('GITHUB_CACHE_MAX_AGE_HOURS', 168)),
+            max_size_mb=float(os.environ.get('GITHUB_CACHE_MAX_SIZE_MB', 50))
+        )
+    except (OSError, ValueError) as e:
+        logger.warning(f"Response cache disabled: {e}")
+        return None
+    
+    if clear:
+        cache.clear()
+    if bypass:
+        logger.info("Response cache bypassed")
+        return None
+    
+    logger.info(f"Using response cache at {cache_dir}")
+    return cache
+
+def _env_list(name: str) -> List[str]:
+    """Read a comma-separated list from the environment"""
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+def _state_path(filename: str) -> str:
+    """Path of a persistent state file kept between runs"""
+    return os.path.join(os.environ.get('GITHUB_STATE_DIR', '.github_state'), filename)
+
+def load_commit_store() -> Optional[CommitStore]:
+    """Open the incremental commit store unless disabled in the environment"""
+    if not _env_flag('GITHUB_INCREMENTAL_COMMITS', default=True):
+        return None
+    try:
+        return CommitStore(_state_path('commits.db'))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Commit store disabled: {e}")
+        return None
+
+def load_repo_state() -> Optional[RepoStateStore]:
+    """Load change-detection state unless a full refresh is forced"""
+    force_refresh = _env_flag('GITHUB_FORCE_REFRESH')
+    if force_refresh:
+        logger.info("Forced refresh: ignoring stored repository state")
+    return RepoStateStore(_state_path('repo_state.json'), load=not force_refresh)
+
+def export_metrics(metrics: RequestMetrics, token_pool: TokenPool):
+    """Write the run's request metrics as JSON and a Prometheus textfile"""
+    metrics_dir = os.environ.get('GITHUB_METRICS_DIR', '.')
+    try:
+        os.makedirs(metrics_dir, exist_ok=True)
+        metrics.export(
+            os.path.join(metrics_dir, 'update_metrics.json'),
+            os.path.join(metrics_dir, 'update_metrics.prom'),
+            token_pool.remaining
+        )
+    except OSError as e:
+        logger.warning(f"Could not export metrics: {e}")
+
+def load_exporter() -> Optional[SnapshotExporter]:
+    """Create the data exporter; GITHUB_EXPORT_FORMATS='' disables it"""
+    formats = _env_list('GITHUB_EXPORT_FORMATS') if 'GITHUB_EXPORT_FORMATS' in os.environ else None
+    if formats == []:
+        return None
+    return SnapshotExporter(os.environ.get('GITHUB_EXPORT_DIR', 'exports'), formats)
+
+def load_badges() -> Optional[BadgeRenderer]:
+    """Create the local badge renderer when GITHUB_LOCAL_BADGES is set"""
+    if not _env_flag('GITHUB_LOCAL_BADGES'):
+        return None
+    return BadgeRenderer(os.environ.get('GITHUB_BADGE_DIR', 'badges'))
+
+def load_history() -> Optional[HistoryStore]:
+    """Open the metrics history unless disabled in the environment"""
+    if not _env_flag('GITHUB_HISTORY', default=True):
+        return None
+    return HistoryStore(_state_path('history'))
+
+def load_transport() -> TransportConfig:
+    """HTTP transport settings from the environment"""
+    return TransportConfig(
+        pool_connections=int(os.environ.get('GITHUB_POOL_CONNECTIONS', 4)),
+        connect_timeout=float(os.environ.get('GITHUB_CONNECT_TIMEOUT', 5)),
+        read_timeout=float(os.environ.get('GITHUB_READ_TIMEOUT', 30)),
+        max_retries=int(os.environ.get('GITHUB_HTTP_RETRIES', 3))
+    )
+
+def load_planner() -> Optional[RunPlanner]:
+    """Create the budget planner unless disabled in the environment"""
+    if not _env_flag('GITHUB_RUN_PLANNER', default=True):
+        return None
+    return RunPlanner(
+        _state_path('checkpoint.json'),
+        reserve=int(os.environ.get('GITHUB_BUDGET_RESERVE', 100))
+    )
+
 def load_config() -> Tuple[str, str, List[RepoConfig]]:
     """Load configuration from environment variables and return settings"""
     
@@ -503,8 +2881,59 @@ def main():
         # Load configuration
         github_token, username, repo_configs = load_config()
         
-        # Initialize updater
-        updater = GitHubRepoUpdater(username, github_token)
+        # Accounts and tokens: one updater per account, all sharing tokens, session and stores
+        accounts = _env_list('GITHUB_ACCOUNTS') or [username]
+        tokens = _env_list('GITHUB_TOKENS') or [github_token]
+        max_workers = int(os.environ.get('GITHUB_MAX_WORKERS', 8))
+        token_pool = TokenPool(tokens, [
+            RateLimiter(
+                requests_per_second=float(os.environ.get('GITHUB_MAX_RPS', 10)),
+                max_retries=int(os.environ.get('GITHUB_MAX_RETRIES', 5))
+            )
+            for _ in tokens
+        ])
+        transport = load_transport()
+        session = create_session(max_workers, f'GitHub-Updater/{username}', transport)
+        cache = load_cache()
+        commit_store = load_commit_store()
+        repo_state = load_repo_state()
+        planner = load_planner()
+        badges = load_badges()
+        history = load_history()
+        metrics = RequestMetrics()
+        
+        updaters = [
+            GitHubRepoUpdater(
+                account, tokens[0], cache=cache, max_workers=max_workers,
+                backend=os.environ.get('GITHUB_FETCH_BACKEND', 'rest').lower(),
+                graphql_batch_size=int(os.environ.get('GITHUB_GRAPHQL_BATCH_SIZE', 25)),
+                commit_store=commit_store, repo_state=repo_state,
+                activity_source=os.environ.get('GITHUB_ACTIVITY_SOURCE', 'commits').lower(),
+                api_base=os.environ.get('GITHUB_API_URL', 'https://api.github.com'),
+                token_pool=token_pool, session=session, metrics=metrics, planner=planner,
+                badges=badges, history=history, transport=transport,
+                trend_days=int(os.environ.get('GITHUB_TREND_DAYS', 30)) if _env_flag('GITHUB_SHOW_TRENDS') else None
+            )
+            for account in accounts
+        ]
+        updater = updaters[0]
+        
+        # Repositories per account; accounts other than the configured user are always discovered
+        account_configs = []
+        for account_updater in updaters:
+            configs = repo_configs if account_updater.username == username else []
+            if _env_flag('GITHUB_DISCOVER_REPOS') or not configs:
+                discovered = account_updater.discover_repositories(
+                    include=_env_list('GITHUB_REPO_INCLUDE'),
+                    exclude=_env_list('GITHUB_REPO_EXCLUDE'),
+                    include_forks=_env_flag('GITHUB_INCLUDE_FORKS'),
+                    include_archived=_env_flag('GITHUB_INCLUDE_ARCHIVED', default=True)
+                )
+                if discovered:
+                    configs = discovered
+                elif configs:
+                    logger.warning("Repository discovery returned nothing, using configured repositories")
+            account_configs.append(configs)
         
         # Check README.md exists
         readme_path = 'README.md'
@@ -518,27 +2947,109 @@ def main():
         
         logger.info("Starting repository status update...")
         
-        # Update repository status table
+        # Fetch every repository once; all renderers read from these snapshots
+        logger.info("Fetching repository data...")
+        account_snapshots = [
+            account_updater.collect_snapshots(configs)
+            for account_updater, configs in zip(updaters, account_configs)
+        ]
+        
+        # Update repository status tables; each section is replaced only if its content changed
         logger.info("Updating repository status table...")
-        updated_content = updater.update_repository_table(readme_content, repo_configs)
+        document = ReadmeDocument(readme_content)
+        migrated = False
+        if len(updaters) == 1 and not document.has('repos'):
+            marked = add_table_markers(readme_content)
+            if marked is not None:
+                document = ReadmeDocument(marked)
+                migrated = True
+        for account_updater, snapshots in zip(updaters, account_snapshots):
+            section = 'repos' if len(updaters) == 1 else f'repos-{account_updater.username}'
+            account_updater.update_table_section(document, section, snapshots)
+        
+        if document.changed or migrated:
+            # Update activity statistics (and the timestamp) only alongside real changes
+            logger.info("Updating activity statistics...")
+            updated_content = updater.update_activity_stats(document.render())
+            
+            # Write updated content back to README
+            with open(readme_path, 'w', encoding='utf-8') as file:
+                file.write(updated_content)
+            logger.info(f"README updated: {', '.join(document.changed) or 'added table markers'}")
+        else:
+            updated_content = readme_content
+            logger.info("README unchanged, skipping write")
+        
+        if badges:
+            removed = badges.prune(updated_content)
+            logger.info(f"Badges: {badges.written} written, {removed} unused removed")
         
-        # Update activity statistics
-        logger.info("Updating activity statistics...")
-        updated_content = updater.update_activity_stats(updated_content)
+        # Record this run's metrics after rendering, so trends compare against earlier runs;
+        # checkpointed snapshots carry old values and would be stamped with this run's time
+        if history:
+            history.append([
+                (account_updater._repo_key(snapshot.name), snapshot)
+                for account_updater, snapshots in zip(updaters, account_snapshots)
+                for snapshot in snapshots if not snapshot.restored
+            ])
         
-        # Write updated content back to README
-        with open(readme_path, 'w', encoding='utf-8') as file:
-            file.write(updated_content)
+        # Export the same data for other consumers, so they never need to call the API themselves
+        exporter = load_exporter()
+        if exporter:
+            try:
+                if exporter.export([
+                    (account_updater.username, snapshot)
+                    for account_updater, snapshots in zip(updaters, account_snapshots)
+                    for snapshot in snapshots
+                ]):
+                    logger.info(f"Exported {', '.join(exporter.formats)} to {exporter.output_dir}/")
+                else:
+                    logger.info("Export data unchanged, skipping write")
+            except OSError as e:
+                logger.warning(f"Could not export repository data: {e}")
         
         # Generate summary report
-        summary = updater.generate_summary_report(repo_configs)
+        summary = "\n".join(
+            account_updater.generate_summary_report(snapshots)
+            for account_updater, snapshots in zip(updaters, account_snapshots)
+        )
         logger.info(summary)
         
         # Save summary to file
         with open('update_summary.txt', 'w') as f:
             f.write(summary)
         
+        if repo_state:
+            repo_state.save()
+        if planner:
+            planner.save()
+        
+        export_metrics(metrics, token_pool)
+        
+        logger.info(f"Total API requests this run: {sum(u.request_count for u in updaters)}")
+        if cache:
+            logger.info(f"Response cache: {cache.hits} revalidated, {cache.misses} fetched")
+        
         logger.info("✅ Repository status updated successfully!")
+        
+        # Watch mode: keep running and refresh single rows as webhooks arrive
+        if _env_flag('GITHUB_WATCH'):
+            def save_state():
+                if repo_state:
+                    repo_state.save()
+                if planner:
+                    planner.save()
+                export_metrics(metrics, token_pool)
+            
+            WebhookWatcher(
+                updaters, account_configs, readme_path,
+                secret=os.environ.get('GITHUB_WEBHOOK_SECRET'),
+                debounce=float(os.environ.get('GITHUB_WEBHOOK_DEBOUNCE', 30)),
+                on_update=save_state
+            ).serve(
+                host=os.environ.get('GITHUB_WEBHOOK_HOST', '127.0.0.1'),
+                port=int(os.environ.get('GITHUB_WEBHOOK_PORT', 8080))
+            )
         return 0
         
     except Exception as e: